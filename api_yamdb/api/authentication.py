@@ -0,0 +1,107 @@
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.tokens import AccessToken
+
+from reviews.models import User
+
+ROLE_CLAIM = 'role'
+USERNAME_CLAIM = 'username'
+SUPERUSER_CLAIM = 'is_superuser'
+TOKEN_USER_CACHE_KEY = 'token-user:{user_id}'
+
+
+class RoleAccessToken(AccessToken):
+    """Access-токен, несущий роль и имя пользователя в claims."""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token[ROLE_CLAIM] = user.role
+        token[USERNAME_CLAIM] = user.username
+        token[SUPERUSER_CLAIM] = user.is_superuser
+        return token
+
+
+class RoleTokenUser(TokenUser):
+    """
+    Пользователь, восстановленный из claims токена без запроса к БД.
+    Поддерживает те же проверки ролей, что и модель User.
+    """
+
+    @property
+    def role(self):
+        return self.token[ROLE_CLAIM]
+
+    @property
+    def is_admin(self):
+        return self.role == User.ROLE_ADMIN
+
+    @property
+    def is_moderator(self):
+        return self.role == User.ROLE_MODERATOR
+
+    @property
+    def is_user(self):
+        return self.role == User.ROLE_USER
+
+    def to_model(self):
+        """Экземпляр User из claims для внешних ключей, без запроса к БД."""
+        return User(
+            pk=self.pk,
+            username=self.username,
+            role=self.role,
+            is_superuser=self.is_superuser,
+        )
+
+
+def load_token_user(user_id):
+    """Роль и статус пользователя из БД; None, если его нет."""
+    return User.objects.filter(pk=user_id).order_by().values(
+        ROLE_CLAIM, SUPERUSER_CLAIM, 'is_active').first()
+
+
+def invalidate_token_user(user, deleted=False):
+    """
+    Сразу применяет новые роль и статус пользователя к его токенам
+    в этом процессе (во всех - при общем кеше). Остальные процессы
+    увидят изменение не позже чем через TOKEN_USER_CACHE_TIMEOUT.
+    """
+    cache.set(
+        TOKEN_USER_CACHE_KEY.format(user_id=user.pk),
+        {
+            ROLE_CLAIM: user.role,
+            SUPERUSER_CLAIM: user.is_superuser,
+            'is_active': user.is_active and not deleted,
+        },
+        timeout=settings.TOKEN_USER_CACHE_TIMEOUT,
+    )
+
+
+class RoleJWTAuthentication(JWTAuthentication):
+    """
+    Аутентификация по claims токена: роль и статус пользователя берутся
+    из кеша и загружаются из БД не чаще раза в TOKEN_USER_CACHE_TIMEOUT,
+    поэтому понижение роли или удаление пользователя действуют быстро,
+    хотя токен живёт сутки. Для токенов без роли пользователь
+    загружается из БД при каждом запросе.
+    """
+
+    def get_user(self, validated_token):
+        if ROLE_CLAIM not in validated_token:
+            return super().get_user(validated_token)
+        user = RoleTokenUser(validated_token)
+        key = TOKEN_USER_CACHE_KEY.format(user_id=user.id)
+        state = cache.get(key)
+        if state is None:
+            state = load_token_user(user.id) or {'is_active': False}
+            cache.set(key, state, settings.TOKEN_USER_CACHE_TIMEOUT)
+        state = dict(state)
+        if not state.pop('is_active'):
+            raise AuthenticationFailed(
+                'Пользователь удалён или неактивен.', code='user_inactive')
+        for claim, value in state.items():
+            validated_token[claim] = value
+        return user
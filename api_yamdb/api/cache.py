@@ -0,0 +1,67 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.response import Response
+
+from api_yamdb.metrics import CATALOG_CACHE
+
+CATALOG_VERSION_KEY = 'catalog-version'
+CATALOG_RESPONSE_KEY = 'catalog:{version}:{digest}'
+
+
+def get_catalog_version():
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        # Начальное значение из времени, чтобы после вытеснения ключа
+        # не вернуться к версии, под которой уже лежат старые ответы.
+        cache.add(CATALOG_VERSION_KEY, int(time.time() * 1000), None)
+        version = cache.get(CATALOG_VERSION_KEY)
+    return version
+
+
+def invalidate_catalog():
+    """Делает недействительными все закешированные ответы каталога."""
+    try:
+        cache.incr(CATALOG_VERSION_KEY)
+    except ValueError:
+        get_catalog_version()
+
+
+class CatalogCacheMixin:
+    """
+    Кеширует ответы list/retrieve по хосту, пути и строке запроса
+    (включая номер страницы). Запись сбрасывается сигналами моделей
+    каталога через invalidate_catalog.
+    """
+
+    def get_cache_key(self, request):
+        digest = hashlib.md5(
+            f'{request.get_host()}{request.get_full_path()}'.encode()
+        ).hexdigest()
+        return CATALOG_RESPONSE_KEY.format(
+            version=get_catalog_version(), digest=digest)
+
+    def get_cached_response(self, action, request, *args, **kwargs):
+        key = self.get_cache_key(request)
+        data = cache.get(key)
+        if data is not None:
+            CATALOG_CACHE.labels('hit').inc()
+            return Response(data)
+        CATALOG_CACHE.labels('miss').inc()
+        response = action(request, *args, **kwargs)
+        cache.set(key, response.data, settings.CATALOG_CACHE_TIMEOUT)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().list, request, *args, **kwargs)
+
+
+class CatalogDetailCacheMixin(CatalogCacheMixin):
+    """То же для вьюсетов с детальным просмотром."""
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().retrieve, request, *args, **kwargs)
@@ -0,0 +1,46 @@
+import hashlib
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+class ConditionalGetMixin:
+    """
+    Поддержка If-None-Match / If-Modified-Since для list и retrieve.
+    Валидаторы строятся из отметки изменения, которую возвращает
+    get_last_modified(), поэтому ответ 304 не требует сериализации.
+    """
+
+    def get_last_modified(self):
+        """Отметка изменения ответа или None, если валидаторов нет."""
+        return None
+
+    def get_etag(self, request, last_modified):
+        source = (
+            f'{request.get_full_path()}:{request.accepted_renderer.format}:'
+            f'{last_modified.isoformat()}'
+        )
+        return quote_etag(hashlib.md5(source.encode()).hexdigest())
+
+    def get_conditional_response(self, action, request, *args, **kwargs):
+        last_modified = self.get_last_modified()
+        if last_modified is None:
+            return action(request, *args, **kwargs)
+        etag = self.get_etag(request, last_modified)
+        timestamp = int(last_modified.timestamp())
+        response = get_conditional_response(
+            request, etag=etag, last_modified=timestamp)
+        if response is not None:
+            return response
+        response = action(request, *args, **kwargs)
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(timestamp)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.get_conditional_response(
+            super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_conditional_response(
+            super().retrieve, request, *args, **kwargs)
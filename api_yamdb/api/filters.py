@@ -1,22 +1,48 @@
 from django_filters import rest_framework as filters
 
+from api.serializers import TITLE_SERVICE_FIELDS
 from reviews.models import Title
+from reviews.search import get_search_backend
+
+
+class NumberInFilter(filters.BaseInFilter, filters.NumberFilter):
+    pass
 
 
 class TitleFilter(filters.FilterSet):
     category = filters.CharFilter(
         field_name='category__slug',
         lookup_expr='icontains')
+    category_slug = filters.CharFilter(
+        field_name='category__slug',
+        lookup_expr='exact')
     genre = filters.CharFilter(
         field_name='genre__slug',
         lookup_expr='icontains')
+    genre_slug = filters.CharFilter(
+        field_name='genre__slug',
+        lookup_expr='exact')
     name = filters.CharFilter(
         field_name='name',
         lookup_expr='icontains')
     year = filters.NumberFilter(
         field_name='year',
-        lookup_expr='icontains')
+        lookup_expr='exact')
+    year_min = filters.NumberFilter(
+        field_name='year',
+        lookup_expr='gte')
+    year_max = filters.NumberFilter(
+        field_name='year',
+        lookup_expr='lte')
+    year__in = NumberInFilter(
+        field_name='year',
+        lookup_expr='in')
+    search = filters.CharFilter(method='filter_search')
 
     class Meta:
         model = Title
-        fields = '__all__'
+        exclude = TITLE_SERVICE_FIELDS
+
+    def filter_search(self, queryset, name, value):
+        """Полнотекстовый поиск, результаты упорядочены по релевантности."""
+        return get_search_backend().search(queryset, value)
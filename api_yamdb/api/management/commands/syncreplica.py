@@ -0,0 +1,62 @@
+import sqlite3
+import time
+from contextlib import closing
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from api.cache import invalidate_catalog
+
+SYNC_INTERVAL = 5
+
+
+def copy_database(source, replica):
+    """
+    Копирует базу SQLite через backup API: копия согласована, даже если
+    в основную базу в это время пишут другие процессы.
+    """
+    replica.close()
+    source.ensure_connection()
+    with closing(sqlite3.connect(replica.settings_dict['NAME'])) as target:
+        source.connection.backup(target)
+
+
+class Command(BaseCommand):
+    help = """Скопировать основную базу SQLite в реплики DATABASE_REPLICAS.
+        Пример: SQLITE_REPLICA=1 python3 manage.py syncreplica --loop"""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Не завершаться, а копировать базу периодически",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=SYNC_INTERVAL,
+            help="Пауза между копированиями, секунды",
+        )
+
+    def handle(self, *args, **options):
+        if not settings.DATABASE_REPLICAS:
+            raise CommandError(
+                "Реплики не настроены: задайте SQLITE_REPLICA=1")
+        source = connections[DEFAULT_DB_ALIAS]
+        replicas = [connections[alias] for alias in settings.DATABASE_REPLICAS]
+        for connection in (source, *replicas):
+            if connection.vendor != "sqlite":
+                raise CommandError(
+                    f"{connection.alias}: копирование поддерживается только "
+                    "для SQLite, для других СУБД настройте их репликацию")
+        while True:
+            for replica in replicas:
+                copy_database(source, replica)
+            # Ответы, закешированные по отставшей реплике, устарели.
+            invalidate_catalog()
+            self.stdout.write(
+                f"Реплики обновлены: {', '.join(settings.DATABASE_REPLICAS)}")
+            if not options["loop"]:
+                return
+            time.sleep(options["interval"])
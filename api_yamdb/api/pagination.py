@@ -1,5 +1,63 @@
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import (
+    CursorPagination,
+    LimitOffsetPagination,
+    PageNumberPagination,
+)
+
+PAGINATION_QUERY_PARAM = 'pagination'
+CURSOR_MODE = 'cursor'
 
 
 class PagePagination(PageNumberPagination):
     page_size = 10
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Курсорная пагинация: страница выбирается диапазоном по индексу,
+    без OFFSET и COUNT(*).
+    """
+    page_size = 10
+
+    def __init__(self, ordering):
+        self.ordering = ordering
+
+
+class CursorOptInMixin:
+    """
+    Переключает пагинацию на курсорную, если в запросе передан
+    ?pagination=cursor (или уже получен курсор следующей страницы).
+    Порядок задаётся в cursor_ordering.
+    """
+    cursor_ordering = None
+
+    def use_cursor(self, request):
+        return (
+            request.query_params.get(PAGINATION_QUERY_PARAM) == CURSOR_MODE
+            or KeysetPagination.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if self.use_cursor(request):
+            self.keyset = KeysetPagination(self.cursor_ordering)
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def to_html(self):
+        if self.keyset:
+            return self.keyset.to_html()
+        return super().to_html()
+
+
+class TitlePagination(CursorOptInMixin, PagePagination):
+    cursor_ordering = ('name', 'id')
+
+
+class PubDatePagination(CursorOptInMixin, LimitOffsetPagination):
+    cursor_ordering = ('-pub_date', '-id')
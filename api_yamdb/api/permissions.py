@@ -15,7 +15,7 @@ class IsOwnerOrReadOnly(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
         if request.method in permissions.SAFE_METHODS:
             return True
-        return (request.user == obj.author or request.user.is_moderator
+        return (request.user.pk == obj.author_id or request.user.is_moderator
                 or request.user.is_admin)
 
 
@@ -0,0 +1,63 @@
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.permissions import SAFE_METHODS
+
+from api_yamdb.routers import replica_reads
+
+PRIMARY_PIN_KEY = 'primary-pin:{user_id}'
+# Бэкенды, данные которых не видны другим процессам.
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+def check_pin_cache():
+    """
+    Закрепление за основной базой хранится в кеше. Следующий запрос
+    пользователя может попасть в другой воркер, поэтому с репликами
+    кеш должен быть общим для всех процессов.
+    """
+    backend = settings.CACHES[DEFAULT_CACHE_ALIAS]['BACKEND']
+    if settings.DATABASE_REPLICAS and backend in PROCESS_LOCAL_CACHES:
+        raise ImproperlyConfigured(
+            f'Кеш {backend} не виден другим процессам, и после записи '
+            'пользователь может прочитать устаревшие данные из реплики: '
+            'с DATABASE_REPLICAS укажите общий бэкенд кеша.')
+
+
+def pin_to_primary(user):
+    cache.set(
+        PRIMARY_PIN_KEY.format(user_id=user.pk), True,
+        settings.REPLICA_PIN_SECONDS)
+
+
+def is_pinned_to_primary(user):
+    return user.is_authenticated and cache.get(
+        PRIMARY_PIN_KEY.format(user_id=user.pk)) is not None
+
+
+class ReplicaReadMixin:
+    """
+    Безопасные запросы читают из реплик (см. api_yamdb/routers.py).
+    После записи пользователь на REPLICA_PIN_SECONDS закрепляется
+    за основной базой и видит свои изменения, пока реплики отстают.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        token = replica_reads.set(False)
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            replica_reads.reset(token)
+
+    def initial(self, request, *args, **kwargs):
+        # После аутентификации и проверки прав: они читают из default.
+        super().initial(request, *args, **kwargs)
+        if request.method not in SAFE_METHODS:
+            if request.user.is_authenticated:
+                pin_to_primary(request.user)
+        elif (settings.DATABASE_REPLICAS
+              and not is_pinned_to_primary(request.user)):
+            replica_reads.set(True)
@@ -1,16 +1,22 @@
 import re
 from rest_framework import serializers
 from rest_framework.relations import SlugRelatedField
-from reviews.models import Category, Genre, Title
+from reviews.models import SCORE_FIELDS, Category, Genre, Title
 from reviews.models import Comment, Review
 from reviews.models import User
+from .timing import TimedSerializerMixin
 from rest_framework.serializers import (
     CharField,
     EmailField,
 )
 
+# Служебные поля произведения, которые не отдаются в API.
+TITLE_SERVICE_FIELDS = (
+    'rating_sum', 'rating_count', 'modified', 'reviews_modified',
+    *SCORE_FIELDS.values())
 
-class BaseUserSerializer(serializers.ModelSerializer):
+
+class BaseUserSerializer(TimedSerializerMixin, serializers.ModelSerializer):
 
     class Meta:
         model = User
@@ -81,12 +87,12 @@ class SignUpSerializer(BaseUserSerializer):
         return data
 
 
-class TokenSerializer(serializers.Serializer):
+class TokenSerializer(TimedSerializerMixin, serializers.Serializer):
     username = CharField(max_length=150, required=True)
     confirmation_code = CharField(required=True)
 
 
-class BasicSerializer(serializers.ModelSerializer):
+class BasicSerializer(TimedSerializerMixin, serializers.ModelSerializer):
 
     class Meta:
         exclude = ('id',)
@@ -104,17 +110,37 @@ class GenreSerializer(BasicSerializer):
         model = Genre
 
 
-class TitleReadSerializer(serializers.ModelSerializer):
+class TitleStatsSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    count = serializers.IntegerField(source='rating_count')
+    average = serializers.FloatField(source='average_score')
+    rating = serializers.IntegerField()
+    histogram = serializers.DictField(
+        source='score_histogram', child=serializers.IntegerField())
+
+    class Meta:
+        fields = ('count', 'average', 'rating', 'histogram')
+        model = Title
+
+
+class TitleReadSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     category = CategorySerializer(read_only=True)
     genre = GenreSerializer(many=True, read_only=True)
     rating = serializers.IntegerField(read_only=True)
 
     class Meta:
-        fields = '__all__'
+        exclude = TITLE_SERVICE_FIELDS
         model = Title
 
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get('request')
+        if request and 'stats' in request.query_params.get(
+                'fields', '').split(','):
+            fields['stats'] = TitleStatsSerializer(source='*', read_only=True)
+        return fields
+
 
-class TitleSerializer(serializers.ModelSerializer):
+class TitleSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     category = SlugRelatedField(
         queryset=Category.objects.all(),
         slug_field='slug')
@@ -123,7 +149,7 @@ class TitleSerializer(serializers.ModelSerializer):
         slug_field='slug', many=True)
 
     class Meta:
-        fields = '__all__'
+        exclude = TITLE_SERVICE_FIELDS
         model = Title
 
     def to_representation(self, instance):
@@ -131,18 +157,18 @@ class TitleSerializer(serializers.ModelSerializer):
         return serializer.data
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     author = serializers.SlugRelatedField(
         read_only=True, slug_field='username'
     )
 
     class Meta:
-        fields = '__all__'
+        exclude = ('comments_modified', )
         model = Review
         read_only_fields = ('title', )
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     author = serializers.SlugRelatedField(
         read_only=True, slug_field='username'
     )
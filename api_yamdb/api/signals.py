@@ -0,0 +1,27 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from reviews.models import Category, Genre, GenreTitle, Review, Title
+from .cache import invalidate_catalog
+
+CATALOG_MODELS = (Category, Genre, Title, GenreTitle, Review)
+
+
+def invalidate_catalog_on_change(sender, **kwargs):
+    # После коммита: иначе параллельный GET закеширует ещё не изменённые
+    # данные под новой версией каталога.
+    transaction.on_commit(invalidate_catalog)
+
+
+# Только для моделей каталога: получатель без sender отключил бы
+# быстрое удаление (одним DELETE без загрузки объектов) у всех моделей.
+for model in CATALOG_MODELS:
+    post_save.connect(invalidate_catalog_on_change, sender=model)
+    post_delete.connect(invalidate_catalog_on_change, sender=model)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def invalidate_catalog_on_genres_change(sender, action, **kwargs):
+    if action.startswith('post_'):
+        transaction.on_commit(invalidate_catalog)
@@ -0,0 +1,118 @@
+import logging
+import time
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+
+from api_yamdb.metrics import observe_request
+
+logger = logging.getLogger('api.timing')
+
+request_timings = ContextVar('request_timings', default=None)
+
+
+class RequestTimings:
+    """Счётчики одного запроса: запросы к БД и время по этапам (в секундах)."""
+
+    __slots__ = ('queries', 'db', 'serializer', 'serializer_depth')
+
+    def __init__(self):
+        self.queries = 0
+        self.db = 0.0
+        self.serializer = 0.0
+        self.serializer_depth = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        """Обёртка connection.execute_wrapper."""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db += time.perf_counter() - started
+            self.queries += 1
+
+
+class TimedSerializerMixin:
+    """
+    Учитывает время сериализации и валидации в счётчиках запроса.
+    Вложенные сериализаторы не учитываются повторно.
+    """
+
+    def timed(self, method, *args):
+        timings = request_timings.get()
+        if timings is None or timings.serializer_depth:
+            return method(*args)
+        timings.serializer_depth += 1
+        started = time.perf_counter()
+        try:
+            return method(*args)
+        finally:
+            timings.serializer += time.perf_counter() - started
+            timings.serializer_depth -= 1
+
+    def to_representation(self, instance):
+        return self.timed(super().to_representation, instance)
+
+    def run_validation(self, *args):
+        return self.timed(super().run_validation, *args)
+
+
+class RequestTimingMiddleware:
+    """
+    Отдаёт заголовок Server-Timing (БД, сериализация и общее время
+    запроса вместе с остальными middleware),
+    пишет строку в лог api.timing и предупреждает о запросах,
+    превысивших REQUEST_QUERY_BUDGET или REQUEST_TIME_BUDGET_MS.
+    Те же значения попадают в метрики Prometheus.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timings = RequestTimings()
+        token = request_timings.set(timings)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(timings))
+                response = self.get_response(request)
+        finally:
+            request_timings.reset(token)
+        elapsed = time.perf_counter() - started
+        response['Server-Timing'] = (
+            f'db;dur={timings.db * 1000:.1f};'
+            f'desc="{timings.queries} queries", '
+            f'serializer;dur={timings.serializer * 1000:.1f}, '
+            f'total;dur={elapsed * 1000:.1f}'
+        )
+        self.log(request, response, timings, elapsed)
+        observe_request(request, response, timings.queries, elapsed)
+        return response
+
+    def log(self, request, response, timings, elapsed):
+        over_budget = (
+            timings.queries > settings.REQUEST_QUERY_BUDGET
+            or elapsed * 1000 > settings.REQUEST_TIME_BUDGET_MS
+        )
+        level = logging.WARNING if over_budget else logging.INFO
+        if not logger.isEnabledFor(level):
+            return
+        fields = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'queries': timings.queries,
+            'db_ms': round(timings.db * 1000, 1),
+            'serializer_ms': round(timings.serializer * 1000, 1),
+            'total_ms': round(elapsed * 1000, 1),
+            'over_budget': over_budget,
+        }
+        logger.log(
+            level,
+            ' '.join(f'{key}={value}' for key, value in fields.items()),
+            extra={'timing': fields},
+        )
@@ -1,10 +1,10 @@
 from rest_framework.routers import DefaultRouter
-from django.urls import include, path
+from django.urls import include, path, re_path
 
 from .views import (
     UserViewSet, ReviewViewSet, CommentViewSet,
     CategoryViewSet, GenreViewSet, TitleViewSet,
-    AuthViewSet, TokenView
+    AuthViewSet, TokenView, ExportView
 )
 
 app_name = 'api'
@@ -32,4 +32,6 @@ v1_router.register(r'titles', TitleViewSet)
 urlpatterns = [
     path('v1/', include(v1_router.urls)),
     path('v1/auth/', include(auth_urls)),
+    re_path(r'^v1/export/(?P<table>\w+)\.(?P<export_format>csv|ndjson)$',
+            ExportView.as_view()),
 ]
@@ -1,28 +1,35 @@
-from django.core.mail import send_mail
 from django.contrib.auth.tokens import default_token_generator
-from django.db.models import Avg
+from django.db import IntegrityError, transaction
 from django.shortcuts import get_object_or_404
 from django.conf import settings
+from django.http import Http404, StreamingHttpResponse
 from rest_framework.exceptions import ValidationError
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import viewsets, mixins, filters, status
+from rest_framework import viewsets, mixins, filters, generics, status
 from rest_framework.decorators import action
 from rest_framework.permissions import SAFE_METHODS
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework import permissions
-from rest_framework_simplejwt.tokens import AccessToken
 
+from reviews.export import CONTENT_TYPES, EXPORT_TABLES, iter_export
 from reviews.models import Review, Title, Category, Genre, User
+from reviews.outbox import enqueue_email
 from .serializers import (
     CategorySerializer, GenreSerializer, TitleSerializer,
-    TitleReadSerializer, ReviewSerializer, CommentSerializer,
-    UserSerializer, SignUpSerializer, TokenSerializer,
+    TitleReadSerializer, TitleStatsSerializer, ReviewSerializer,
+    CommentSerializer, UserSerializer, SignUpSerializer, TokenSerializer,
     UserPatchSerializer
 )
+from .cache import CatalogCacheMixin, CatalogDetailCacheMixin
+from .conditional import ConditionalGetMixin
+from .replicas import ReplicaReadMixin
+from .authentication import (
+    RoleAccessToken, RoleTokenUser, invalidate_token_user
+)
 from .permissions import IsOwnerOrReadOnly, IsAdmin, IsAdminOrReadOnly
 from .filters import TitleFilter
-from .pagination import PagePagination
+from .pagination import PagePagination, PubDatePagination, TitlePagination
 from .utils import generate_confirmation_code
 
 
@@ -36,16 +43,29 @@ class UserViewSet(viewsets.ModelViewSet):
     filterset_fields = ['username']
     search_fields = ['username']
 
+    def perform_update(self, serializer):
+        old_role = serializer.instance.role
+        user = serializer.save()
+        if user.role != old_role:
+            invalidate_token_user(user)
+
+    def perform_destroy(self, instance):
+        invalidate_token_user(instance, deleted=True)
+        instance.delete()
+
+    def get_request_user(self):
+        return get_object_or_404(User, pk=self.request.user.pk)
+
     @action(detail=False, methods=["get"],
             permission_classes=[permissions.IsAuthenticated])
     def me(self, request):
-        user = request.user
+        user = self.get_request_user()
         serializer = UserSerializer(user)
         return Response(serializer.data)
 
     @me.mapping.patch
     def patch_me(self, request):
-        user = request.user
+        user = self.get_request_user()
         serializer = UserPatchSerializer(user, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
         serializer.save()
@@ -60,12 +80,11 @@ class AuthViewSet(APIView):
         confirmation_code = generate_confirmation_code()
         user.confirmation_code = default_token_generator.make_token(user)
         user.save()
-        send_mail(
+        enqueue_email(
             'Код подтверждения',
             f'Ваш код подтверждения: {confirmation_code}',
             settings.EMAIL_API_NO_REPLY,
-            [user.email],
-            fail_silently=False,
+            user.email,
         )
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -86,13 +105,29 @@ class TokenView(APIView):
                 'Вы ошиблись в поле toden или username',
                 status=status.HTTP_400_BAD_REQUEST
             )
-        some_token = AccessToken.for_user(user)
+        some_token = RoleAccessToken.for_user(user)
         token = {
             'token': str(some_token),
         }
         return Response(token, status=status.HTTP_200_OK)
 
 
+class ExportView(APIView):
+    """Потоковая выгрузка таблицы в CSV или NDJSON для администраторов."""
+    permission_classes = [IsAdmin, ]
+
+    def get(self, request, table, export_format):
+        if table not in EXPORT_TABLES:
+            raise Http404
+        response = StreamingHttpResponse(
+            iter_export(table, export_format),
+            content_type=CONTENT_TYPES[export_format],
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="{table}.{export_format}"')
+        return response
+
+
 class CreateListDestroyViewSet(mixins.CreateModelMixin,
                                mixins.ListModelMixin,
                                mixins.DestroyModelMixin,
@@ -100,7 +135,8 @@ class CreateListDestroyViewSet(mixins.CreateModelMixin,
     pass
 
 
-class BasicViewSet(CreateListDestroyViewSet):
+class BasicViewSet(ReplicaReadMixin, CatalogCacheMixin,
+                   CreateListDestroyViewSet):
     permission_classes = [IsAdminOrReadOnly, ]
     filter_backends = (filters.SearchFilter,)
     search_fields = ('name',)
@@ -118,13 +154,14 @@ class GenreViewSet(BasicViewSet):
     serializer_class = GenreSerializer
 
 
-class TitleViewSet(viewsets.ModelViewSet):
-    queryset = Title.objects.annotate(
-        rating=Avg('reviews__score')).order_by('name')
+class TitleViewSet(ReplicaReadMixin, ConditionalGetMixin,
+                   CatalogDetailCacheMixin, viewsets.ModelViewSet):
+    queryset = Title.objects.select_related('category').prefetch_related(
+        'genre').order_by('name')
     permission_classes = [IsAdminOrReadOnly, ]
     filter_backends = (DjangoFilterBackend,)
     filterset_class = TitleFilter
-    pagination_class = PagePagination
+    pagination_class = TitlePagination
     http_method_names = ("get", "post", "delete", "patch")
 
     def get_serializer_class(self):
@@ -132,48 +169,104 @@ class TitleViewSet(viewsets.ModelViewSet):
             return TitleReadSerializer
         return TitleSerializer
 
+    @action(detail=False, methods=["get"])
+    def trending(self, request):
+        queryset = self.get_queryset().filter(
+            trend__isnull=False).order_by('-trend__score')
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @action(detail=True, methods=["get"])
+    def similar(self, request, pk=None):
+        generics.get_object_or_404(Title, pk=pk)
+        queryset = self.get_queryset().filter(
+            similar_of__title_id=pk).order_by('-similar_of__score')
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @action(detail=True, methods=["get"])
+    def stats(self, request, pk=None):
+        title = generics.get_object_or_404(Title, pk=pk)
+        serializer = TitleStatsSerializer(title)
+        return Response(serializer.data)
+
+    def get_last_modified(self):
+        if self.action != 'retrieve':
+            return None
+        try:
+            return Title.objects.filter(pk=self.kwargs['pk']).values_list(
+                'modified', flat=True).first()
+        except (TypeError, ValueError):
+            raise Http404
 
-class ReviewViewSet(viewsets.ModelViewSet):
+
+def get_author(user):
+    """Автор для внешнего ключа без повторной загрузки пользователя."""
+    if isinstance(user, RoleTokenUser):
+        return user.to_model()
+    return user
+
+
+class ReviewViewSet(ReplicaReadMixin, ConditionalGetMixin,
+                    viewsets.ModelViewSet):
     serializer_class = ReviewSerializer
     permission_classes = [IsOwnerOrReadOnly]
+    pagination_class = PubDatePagination
     http_method_names = ("get", "post", "delete", "patch")
 
     def get_title(self):
-        title_id = self.kwargs['title_id']
-        return get_object_or_404(Title, id=title_id)
+        if not hasattr(self, '_title'):
+            self._title = get_object_or_404(Title, id=self.kwargs['title_id'])
+        return self._title
 
     def get_queryset(self):
-        return self.get_title().reviews.all()
+        return self.get_title().reviews.select_related('author')
 
-    def perform_create(self, serializer):
-        title = self.get_title()
-        existing_review = Review.objects.filter(
-            author=self.request.user, title=title)
+    def get_last_modified(self):
+        return self.get_title().reviews_modified
 
-        if existing_review.exists():
+    def perform_create(self, serializer):
+        author = get_author(self.request.user)
+        try:
+            with transaction.atomic():
+                serializer.save(author=author, title=self.get_title())
+        except IntegrityError:
+            # Только нарушение unique_review_per_user_title; ошибка внешнего
+            # ключа (автор удалён после выдачи токена) не маскируется.
+            if not Review.objects.filter(
+                    author=author, title=self.get_title()).exists():
+                raise
             raise ValidationError(
                 'Вы уже оставили отзыв на это произведение.')
-        serializer.save(author=self.request.user, title=title)
+
+    def perform_update(self, serializer):
+        with transaction.atomic():
+            serializer.save()
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(ReplicaReadMixin, ConditionalGetMixin,
+                     viewsets.ModelViewSet):
     serializer_class = CommentSerializer
     permission_classes = [IsOwnerOrReadOnly]
+    pagination_class = PubDatePagination
     http_method_names = ("get", "post", "delete", "patch")
 
-    def get_title(self):
-        title_id = self.kwargs['title_id']
-        return get_object_or_404(Title, id=title_id)
-
     def get_review(self):
-        review_id = self.kwargs['review_id']
-        return get_object_or_404(
-            Review, id=review_id,
-            title=self.kwargs['title_id']
-        )
+        if not hasattr(self, '_review'):
+            self._review = get_object_or_404(
+                Review, id=self.kwargs['review_id'],
+                title=self.kwargs['title_id']
+            )
+        return self._review
 
     def get_queryset(self):
-        return self.get_review().comments.all()
+        return self.get_review().comments.select_related('author')
+
+    def get_last_modified(self):
+        return self.get_review().comments_modified
 
     def perform_create(self, serializer):
-        serializer.save(author=self.request.user, review=self.get_review())
+        serializer.save(
+            author=get_author(self.request.user), review=self.get_review())
@@ -0,0 +1,90 @@
+"""
+Метрики в формате Prometheus.
+
+В одном процессе значения хранятся в памяти. Для нескольких процессов
+(gunicorn, uwsgi) перед запуском задайте переменную окружения
+PROMETHEUS_MULTIPROC_DIR: каждый процесс пишет значения в свои файлы
+в этом каталоге, а /metrics суммирует их. Каталог нужно очищать при
+перезапуске сервера.
+"""
+import os
+
+from django.http import HttpResponse
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge,
+    Histogram, generate_latest, multiprocess,
+)
+
+UNMATCHED_ROUTE = 'unmatched'
+
+REQUESTS = Counter(
+    'yamdb_http_requests_total',
+    'Количество HTTP-запросов',
+    ('route', 'method', 'status'),
+)
+REQUEST_LATENCY = Histogram(
+    'yamdb_http_request_duration_seconds',
+    'Время обработки HTTP-запроса',
+    ('route', 'method'),
+)
+REQUEST_QUERIES = Histogram(
+    'yamdb_http_request_db_queries',
+    'Количество запросов к БД за HTTP-запрос',
+    ('route',),
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, float('inf')),
+)
+CATALOG_CACHE = Counter(
+    'yamdb_catalog_cache_requests_total',
+    'Обращения к кешу ответов каталога',
+    ('result',),
+)
+EMAILS = Counter(
+    'yamdb_emails_total',
+    'Исходящие письма',
+    ('result',),
+)
+DB_POOL_CHECKOUTS = Counter(
+    'yamdb_db_pool_checkouts_total',
+    'Выдача соединений из пула: reused, new или timeout',
+    ('alias', 'result'),
+)
+DB_POOL_WAIT = Histogram(
+    'yamdb_db_pool_wait_seconds',
+    'Ожидание свободного соединения в пуле',
+    ('alias',),
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, float('inf')),
+)
+DB_POOL_CONNECTIONS = Gauge(
+    'yamdb_db_pool_connections',
+    'Открытые соединения пула: idle или in_use',
+    ('alias', 'state'),
+    multiprocess_mode='livesum',
+)
+
+
+def get_route(request):
+    """Имя маршрута (например, title-list) или его шаблон."""
+    match = request.resolver_match
+    if match is None:
+        return UNMATCHED_ROUTE
+    return match.url_name or match.route
+
+
+def observe_request(request, response, queries, elapsed):
+    route = get_route(request)
+    REQUESTS.labels(route, request.method, response.status_code).inc()
+    REQUEST_LATENCY.labels(route, request.method).observe(elapsed)
+    REQUEST_QUERIES.labels(route).observe(queries)
+
+
+def get_registry():
+    if 'PROMETHEUS_MULTIPROC_DIR' not in os.environ:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def metrics_view(request):
+    return HttpResponse(
+        generate_latest(get_registry()), content_type=CONTENT_TYPE_LATEST)
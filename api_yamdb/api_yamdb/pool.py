@@ -0,0 +1,239 @@
+"""
+Постоянные соединения с проверкой и пул соединений для бэкендов БД.
+
+CONN_HEALTH_CHECKS (как в Django 4.1): соединение, пережившее
+HTTP-запрос благодаря CONN_MAX_AGE, проверяется перед первым запросом
+к БД в следующем HTTP-запросе и переоткрывается, если сервер его закрыл.
+
+OPTIONS['pool'] (как в Django 5.1): соединения не закрываются в конце
+HTTP-запроса, а возвращаются в пул процесса и выдаются любому потоку.
+Ключи: max_size -- сколько соединений держит один процесс (задайте
+по числу потоков воркера), timeout -- сколько секунд ждать свободное
+соединение, max_lifetime -- через сколько секунд соединение
+переоткрывается. С пулом CONN_MAX_AGE должен быть 0.
+"""
+import os
+import threading
+import time
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import OperationalError
+
+from api_yamdb.metrics import (
+    DB_POOL_CHECKOUTS, DB_POOL_CONNECTIONS, DB_POOL_WAIT,
+)
+
+POOL_MAX_SIZE = 4
+POOL_TIMEOUT = 30
+POOL_MAX_LIFETIME = 3600
+
+# Пулы по (pid, alias): дочерний процесс после fork заводит свои,
+# не трогая унаследованные сокеты родителя.
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def is_usable(connection):
+    try:
+        cursor = connection.cursor()
+        try:
+            cursor.execute('SELECT 1')
+        finally:
+            cursor.close()
+    except Exception:
+        return False
+    return True
+
+
+def close_quietly(connection):
+    try:
+        connection.close()
+    except Exception:
+        pass
+
+
+class ConnectionPool:
+    """Соединения DB-API одного псевдонима БД в пределах процесса."""
+
+    def __init__(self, alias, max_size=POOL_MAX_SIZE, timeout=POOL_TIMEOUT,
+                 max_lifetime=POOL_MAX_LIFETIME, check=False):
+        self.alias = alias
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.check = check
+        self.idle = []
+        # Открытые соединения пула, свободные и выданные, вместе
+        # с местами под открываемые сейчас.
+        self.size = 0
+        self.opened = {}
+        self.condition = threading.Condition()
+
+    def checkout(self, connect):
+        """
+        Свободное соединение или новое, созданное connect(), если пул
+        не заполнен. Иначе ждёт возврата соединения до timeout секунд.
+        """
+        started = time.monotonic()
+        while True:
+            connection = self.acquire(started)
+            if connection is None:
+                result = 'new'
+                try:
+                    connection = connect()
+                except BaseException:
+                    self.release()
+                    raise
+                with self.condition:
+                    self.opened[id(connection)] = time.monotonic()
+                break
+            if not self.is_expired(connection) and (
+                    not self.check or is_usable(connection)):
+                result = 'reused'
+                break
+            self.discard(connection)
+        DB_POOL_WAIT.labels(self.alias).observe(time.monotonic() - started)
+        DB_POOL_CHECKOUTS.labels(self.alias, result).inc()
+        return connection
+
+    def acquire(self, started):
+        """Свободное соединение или None, если занято место под новое."""
+        with self.condition:
+            while not self.idle and self.size >= self.max_size:
+                remaining = started + self.timeout - time.monotonic()
+                if remaining <= 0:
+                    DB_POOL_CHECKOUTS.labels(self.alias, 'timeout').inc()
+                    raise OperationalError(
+                        f'Нет свободного соединения с базой {self.alias} '
+                        f'за {self.timeout} с: увеличьте размер пула')
+                self.condition.wait(remaining)
+            connection = None
+            if self.idle:
+                connection = self.idle.pop()
+            else:
+                self.size += 1
+            self.report()
+            return connection
+
+    def checkin(self, connection):
+        if self.is_expired(connection):
+            self.discard(connection)
+            return
+        try:
+            connection.rollback()
+        except Exception:
+            self.discard(connection)
+            return
+        with self.condition:
+            self.idle.append(connection)
+            self.report()
+            self.condition.notify()
+
+    def discard(self, connection):
+        close_quietly(connection)
+        with self.condition:
+            del self.opened[id(connection)]
+        self.release()
+
+    def release(self):
+        with self.condition:
+            self.size -= 1
+            self.report()
+            self.condition.notify()
+
+    def is_expired(self, connection):
+        opened = self.opened.get(id(connection))
+        return (opened is not None
+                and time.monotonic() - opened >= self.max_lifetime)
+
+    def report(self):
+        DB_POOL_CONNECTIONS.labels(self.alias, 'idle').set(len(self.idle))
+        DB_POOL_CONNECTIONS.labels(self.alias, 'in_use').set(
+            self.size - len(self.idle))
+
+    def close(self):
+        """Закрывает свободные соединения; выданные закроются при возврате."""
+        with self.condition:
+            idle, self.idle = self.idle, []
+        for connection in idle:
+            self.discard(connection)
+
+
+def get_pool(alias, **options):
+    key = (os.getpid(), alias)
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = ConnectionPool(alias, **options)
+        return _pools[key]
+
+
+def close_pools():
+    pid = os.getpid()
+    with _pools_lock:
+        pools = [pool for (owner, _), pool in _pools.items() if owner == pid]
+    for pool in pools:
+        pool.close()
+
+
+class PooledDatabaseWrapperMixin:
+    """
+    Проверка постоянных соединений и пул для DatabaseWrapper.
+    Подклассы открывают соединение в create_connection, а не
+    в get_new_connection: подготовка выполняется только для новых
+    соединений, а не при каждой выдаче из пула.
+    """
+
+    pool = None
+    health_check_done = False
+
+    @property
+    def health_check_enabled(self):
+        return self.settings_dict.get('CONN_HEALTH_CHECKS', False)
+
+    def get_connection_params(self):
+        kwargs = super().get_connection_params()
+        options = kwargs.pop('pool', None)
+        if not options:
+            return kwargs
+        if self.settings_dict['CONN_MAX_AGE'] != 0:
+            raise ImproperlyConfigured(
+                'Пул соединений несовместим с постоянными соединениями: '
+                'задайте CONN_MAX_AGE = 0.')
+        self.pool = get_pool(
+            self.alias, check=self.health_check_enabled,
+            **({} if options is True else options))
+        return kwargs
+
+    def create_connection(self, conn_params):
+        return super().get_new_connection(conn_params)
+
+    def get_new_connection(self, conn_params):
+        if self.pool is None:
+            return self.create_connection(conn_params)
+        return self.pool.checkout(
+            lambda: self.create_connection(conn_params))
+
+    def _close(self):
+        if self.pool is None or self.connection is None:
+            return super()._close()
+        self.pool.checkin(self.connection)
+
+    def connect(self):
+        super().connect()
+        self.health_check_done = True
+
+    def close_if_unusable_or_obsolete(self):
+        self.health_check_done = False
+        super().close_if_unusable_or_obsolete()
+
+    def close_if_health_check_failed(self):
+        if (self.connection is None or not self.health_check_enabled
+                or self.health_check_done):
+            return
+        self.health_check_done = True
+        if not self.in_atomic_block and not self.is_usable():
+            self.close()
+
+    def _cursor(self, name=None):
+        self.close_if_health_check_failed()
+        return super()._cursor(name)
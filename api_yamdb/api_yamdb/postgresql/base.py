@@ -0,0 +1,11 @@
+"""
+PostgreSQL с пулом соединений и проверкой постоянных соединений
+(см. api_yamdb/pool.py). Требует psycopg2.
+"""
+from django.db.backends.postgresql import base
+
+from api_yamdb.pool import PooledDatabaseWrapperMixin
+
+
+class DatabaseWrapper(PooledDatabaseWrapperMixin, base.DatabaseWrapper):
+    pass
@@ -0,0 +1,39 @@
+"""
+Чтение из реплик.
+
+Представления с ReplicaReadMixin (api/replicas.py) на время безопасного
+запроса включают replica_reads, и чтения уходят в одну из баз
+DATABASE_REPLICAS. Запись всегда идёт в default и до конца запроса
+возвращает туда же чтения, чтобы запрос видел собственные изменения.
+"""
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+replica_reads = ContextVar('replica_reads', default=False)
+
+
+class ReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        if replica_reads.get() and settings.DATABASE_REPLICAS:
+            return random.choice(settings.DATABASE_REPLICAS)
+        # Явно, а не None: иначе объект, прочитанный из реплики,
+        # тянул бы туда же связанные объекты и после записи.
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        replica_reads.set(False)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if {obj1._state.db, obj2._state.db} <= databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Схему реплики получают вместе с данными.
+        return db not in settings.DATABASE_REPLICAS
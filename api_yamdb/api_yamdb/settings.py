@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 from datetime import timedelta
@@ -30,6 +31,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.timing.RequestTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -63,13 +65,156 @@ WSGI_APPLICATION = 'api_yamdb.wsgi.application'
 
 # Database
 
+# SQLite в режиме WAL: чтение не ждёт записи, запись сбрасывается на диск
+# только при контрольных точках (synchronous=NORMAL). Транзакции
+# начинаются с BEGIN IMMEDIATE и ждут освобождения базы до timeout секунд
+# (см. api_yamdb/sqlite3/base.py).
+
+SQLITE_BUSY_TIMEOUT = 20
+
+SQLITE_PRAGMAS = (
+    'PRAGMA journal_mode = WAL',
+    'PRAGMA synchronous = NORMAL',
+    'PRAGMA cache_size = -65536',
+    'PRAGMA mmap_size = 268435456',
+    'PRAGMA temp_store = MEMORY',
+)
+
+# Соединения с БД (см. api_yamdb/pool.py). Без пула соединение потока
+# живёт DB_CONN_MAX_AGE секунд и проверяется в начале каждого HTTP-запроса.
+# Для серверной СУБД задайте DB_POOL_SIZE: каждый процесс держит пул
+# не больше чем из DB_POOL_SIZE соединений (по числу потоков воркера),
+# всего соединений - число воркеров, умноженное на DB_POOL_SIZE.
+
+DB_CONN_MAX_AGE = int(os.getenv('DB_CONN_MAX_AGE', 60))
+
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 0))
+
+DB_POOL_TIMEOUT = 10
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        'ENGINE': 'api_yamdb.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            'timeout': SQLITE_BUSY_TIMEOUT,
+            'transaction_mode': 'IMMEDIATE',
+            'lock_retries': 3,
+            'init_command': ';'.join(SQLITE_PRAGMAS),
+        },
+    }
+}
+
+if os.getenv('POSTGRES_DB'):
+    DATABASES['default'] = {
+        'ENGINE': 'api_yamdb.postgresql',
+        'NAME': os.getenv('POSTGRES_DB'),
+        'USER': os.getenv('POSTGRES_USER', 'postgres'),
+        'PASSWORD': os.getenv('POSTGRES_PASSWORD', ''),
+        'HOST': os.getenv('DB_HOST', 'localhost'),
+        'PORT': os.getenv('DB_PORT', '5432'),
+        'OPTIONS': {},
+    }
+
+DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+
+if DB_POOL_SIZE:
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default']['OPTIONS']['pool'] = {
+        'max_size': DB_POOL_SIZE,
+        'timeout': DB_POOL_TIMEOUT,
+    }
+else:
+    DATABASES['default']['CONN_MAX_AGE'] = DB_CONN_MAX_AGE
+
+# Реплики только для чтения (см. api_yamdb/routers.py). Локально реплика -
+# копия db.sqlite3, которую обновляет команда syncreplica; включается
+# переменной окружения SQLITE_REPLICA=1.
+
+DATABASE_REPLICAS = []
+
+if os.getenv('SQLITE_REPLICA'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': BASE_DIR / 'db-replica.sqlite3',
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append('replica')
+
+DATABASE_ROUTERS = ['api_yamdb.routers.ReplicaRouter']
+
+# Сколько секунд после записи чтения пользователя идут в основную базу.
+
+REPLICA_PIN_SECONDS = 10
+
+
+# Cache
+# Локальная память процесса. При нескольких воркерах укажите общий бэкенд
+# (например, django.core.cache.backends.filebased.FileBasedCache),
+# иначе сброс кеша каталога увидит только процесс, выполнивший запись.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'api_yamdb',
     }
 }
 
+# С репликами кеш хранит закрепление пользователя за основной базой
+# (api/replicas.py), и его должны видеть все воркеры.
+
+if DATABASE_REPLICAS:
+    CACHES['default'] = {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache',
+    }
+
+CATALOG_CACHE_TIMEOUT = 300
+
+# Период полураспада вклада отзыва в популярность произведения.
+
+TRENDING_HALF_LIFE_HOURS = 72
+
+# Количество похожих произведений, сохраняемых командой updatesimilar.
+
+SIMILAR_TITLES_COUNT = 10
+
+# Бюджеты запроса: при превышении RequestTimingMiddleware пишет
+# предупреждение в лог api.timing.
+
+REQUEST_QUERY_BUDGET = 20
+
+REQUEST_TIME_BUDGET_MS = 500
+
+# Строки api.timing уровня INFO по каждому запросу; без обработчика
+# Python выводит только предупреждения.
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'timing': {
+            'format': '%(asctime)s %(levelname)s %(name)s %(message)s',
+        },
+    },
+    'handlers': {
+        'timing': {
+            'class': 'logging.StreamHandler',
+            'formatter': 'timing',
+        },
+    },
+    'loggers': {
+        'api.timing': {
+            'handlers': ['timing'],
+            'level': os.getenv('REQUEST_TIMING_LOG_LEVEL', 'INFO'),
+        },
+    },
+}
+
+# Метрики Prometheus отдаются на /metrics. При нескольких процессах
+# задайте переменную окружения PROMETHEUS_MULTIPROC_DIR
+# (см. api_yamdb/metrics.py).
+
 
 # Password validation
 
@@ -110,7 +255,7 @@ STATICFILES_DIRS = ((BASE_DIR / 'static/'),)
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.RoleJWTAuthentication',
     ],
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.LimitOffsetPagination",
     "PAGE_SIZE": 10,
@@ -123,6 +268,11 @@ SIMPLE_JWT = {
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
+# Сколько секунд роль и статус пользователя из access-токена доверяются
+# кешу, прежде чем перечитываются из БД.
+
+TOKEN_USER_CACHE_TIMEOUT = 60
+
 AUTH_USER_MODEL = 'reviews.User'
 
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
@@ -130,3 +280,12 @@ EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
 
 EMAIL_API_NO_REPLY = 'noreply@yamd.com'
+
+# Очередь исходящих писем: отправляет команда sendoutbox.
+# EMAIL_OUTBOX_EAGER отправляет письмо сразу после коммита запроса.
+
+EMAIL_OUTBOX_EAGER = False
+
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+
+EMAIL_OUTBOX_RETRY_DELAY = 60
@@ -0,0 +1,56 @@
+"""
+SQLite с настройкой соединения для нескольких процессов.
+
+Дополнительные ключи OPTIONS (те же, что у встроенного бэкенда
+в Django 5.1, и lock_retries):
+
+init_command -- PRAGMA через «;», выполняются при каждом подключении;
+transaction_mode -- режим BEGIN для atomic(): IMMEDIATE берёт блокировку
+    записи в начале транзакции, и ожидание занятой базы покрывается
+    timeout, а не падает на первой записи после чтения;
+lock_retries -- сколько раз повторить BEGIN, если база так и осталась
+    занята после timeout. Повтор безопасен: транзакция ещё не начата.
+
+Проверка постоянных соединений и пул -- см. api_yamdb/pool.py.
+"""
+import time
+
+from django.db import OperationalError
+from django.db.backends.sqlite3 import base
+
+from api_yamdb.pool import PooledDatabaseWrapperMixin
+
+LOCK_RETRY_DELAY = 0.05
+
+
+class DatabaseWrapper(PooledDatabaseWrapperMixin, base.DatabaseWrapper):
+    init_command = None
+    transaction_mode = None
+    lock_retries = 0
+
+    def get_connection_params(self):
+        kwargs = super().get_connection_params()
+        self.init_command = kwargs.pop("init_command", None)
+        self.transaction_mode = kwargs.pop("transaction_mode", None)
+        self.lock_retries = kwargs.pop("lock_retries", 0)
+        return kwargs
+
+    def create_connection(self, conn_params):
+        conn = super().create_connection(conn_params)
+        for statement in (self.init_command or "").split(";"):
+            if statement.strip():
+                conn.execute(statement)
+        return conn
+
+    def _start_transaction_under_autocommit(self):
+        # Режим транзакции известен только после подключения.
+        self.ensure_connection()
+        begin = f"BEGIN {self.transaction_mode or ''}".strip()
+        for attempt in range(self.lock_retries + 1):
+            try:
+                self.cursor().execute(begin)
+                return
+            except OperationalError as e:
+                if "locked" not in str(e) or attempt == self.lock_retries:
+                    raise
+                time.sleep(LOCK_RETRY_DELAY * 2 ** attempt)
@@ -1,10 +1,16 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 
-from reviews.models import User, Category, Genre, Review, Title
+from reviews.models import (User, Category, Genre, Review, Title,
+                            OutgoingEmail, TitleTrend, SimilarTitle,
+                            ImportCheckpoint)
 
 admin.site.register(User, UserAdmin)
 admin.site.register(Category)
 admin.site.register(Genre)
 admin.site.register(Review)
 admin.site.register(Title)
+admin.site.register(OutgoingEmail)
+admin.site.register(TitleTrend)
+admin.site.register(SimilarTitle)
+admin.site.register(ImportCheckpoint)
@@ -0,0 +1,276 @@
+"""
+Синтетические данные для нагрузочного тестирования.
+Популярность произведений распределена по закону Ципфа, активность
+пользователей - по степенному закону. При одинаковых параметрах
+и seed результат одинаков.
+"""
+import csv
+from contextlib import contextmanager
+
+import numpy as np
+from django.db import connection, transaction
+from django.core.management.color import no_style
+
+from reviews.export import EXPORT_TABLES, get_field_name
+
+TITLE_EXPONENT = 1.0
+USER_EXPONENT = 0.6
+MAX_ROUNDS = 20
+CHUNK_SIZE = 10_000
+MIN_YEAR, MAX_YEAR = 1900, 2023
+MAX_GENRES_PER_TITLE = 3
+# Средний возраст отзыва и средняя задержка комментария к отзыву.
+REVIEW_AGE_DAYS = 365
+COMMENT_DELAY_DAYS = 2
+SECONDS_PER_DAY = 24 * 60 * 60
+# Кеш страниц SQLite на время вставки, КиБ. Со стандартными 2 МиБ
+# вставки в случайном порядке в индексы отзывов упираются в чтение с диска.
+SQLITE_BULK_CACHE_KIB = 256 * 1024
+
+
+def powerlaw(size, exponent):
+    """Вероятности рангов 1..size, пропорциональные rank ** -exponent."""
+    weights = np.arange(1, size + 1, dtype=np.float64) ** -exponent
+    return weights / weights.sum()
+
+
+@contextmanager
+def bulk_load_cache():
+    if connection.vendor != "sqlite":
+        yield
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA cache_size")
+        cache_size, = cursor.fetchone()
+        cursor.execute(f"PRAGMA cache_size = -{SQLITE_BULK_CACHE_KIB}")
+    try:
+        yield
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute(f"PRAGMA cache_size = {cache_size}")
+
+
+class SyntheticDataset:
+    """
+    Таблицы в раскладке loadcsv (reviews.export.EXPORT_TABLES):
+    для каждой колонки массив numpy или шаблон текста по id.
+    """
+
+    def __init__(self, reviews, titles, users, comments, categories,
+                 genres, end_date, seed=0, title_exponent=TITLE_EXPONENT,
+                 user_exponent=USER_EXPONENT):
+        self.sizes = {
+            "review": reviews, "titles": titles, "users": users,
+            "comments": comments, "category": categories, "genre": genres,
+        }
+        self.end_date = np.datetime64(end_date, "s")
+        self.rng = np.random.default_rng(seed)
+        # Ранги популярности раздаются id в случайном порядке.
+        self.title_p = powerlaw(titles, title_exponent)
+        self.title_rank = self.rng.permutation(titles)
+        self.user_p = powerlaw(users, user_exponent)
+        self.user_rank = self.rng.permutation(users)
+        self.tables = {}
+
+    def sample_titles(self, size):
+        return self.title_rank[
+            self.rng.choice(len(self.title_rank), size, p=self.title_p)]
+
+    def sample_users(self, size):
+        return self.user_rank[
+            self.rng.choice(len(self.user_rank), size, p=self.user_p)]
+
+    def review_pairs(self):
+        """
+        Уникальные пары (произведение, автор): выборки с повторами
+        прореживаются, недостающие пары добираются новыми раундами.
+        """
+        total, n_users = self.sizes["review"], self.sizes["users"]
+        keys = np.empty(0, dtype=np.int64)
+        for _ in range(MAX_ROUNDS):
+            need = total - len(keys)
+            if need <= 0:
+                break
+            size = int(need * 1.1) + 10
+            keys = np.unique(np.concatenate((
+                keys,
+                self.sample_titles(size).astype(np.int64) * n_users
+                + self.sample_users(size),
+            )))
+        if len(keys) < total:
+            raise ValueError(
+                f"Удалось составить только {len(keys)} уникальных пар "
+                "произведение-автор: увеличьте число пользователей "
+                "или произведений")
+        keys = self.rng.permutation(keys)[:total]
+        return keys // n_users, keys % n_users
+
+    def ids(self, table):
+        return np.arange(1, self.sizes[table] + 1)
+
+    def dates_before(self, end, mean_days, size):
+        seconds = self.rng.exponential(mean_days * SECONDS_PER_DAY, size)
+        return end - seconds.astype("timedelta64[s]")
+
+    def build_category(self):
+        return {"id": self.ids("category"), "name": "Категория {}",
+                "slug": "category-{}"}
+
+    def build_genre(self):
+        return {"id": self.ids("genre"), "name": "Жанр {}",
+                "slug": "genre-{}"}
+
+    def build_titles(self):
+        size = self.sizes["titles"]
+        categories = self.sizes["category"]
+        category = self.rng.choice(
+            categories, size, p=powerlaw(categories, 1.0)) + 1
+        return {
+            "id": self.ids("titles"),
+            "name": "Произведение {}",
+            "year": self.rng.integers(MIN_YEAR, MAX_YEAR + 1, size),
+            "category": category,
+        }
+
+    def build_genre_title(self):
+        titles, genres = self.sizes["titles"], self.sizes["genre"]
+        counts = self.rng.integers(
+            1, min(MAX_GENRES_PER_TITLE, genres) + 1, titles)
+        title = np.repeat(np.arange(titles), counts)
+        # k-й жанр произведения - следующий после k-1-го по кругу.
+        within = np.arange(len(title)) - np.repeat(
+            np.cumsum(counts) - counts, counts)
+        first = self.rng.integers(0, genres, titles)
+        return {
+            "id": np.arange(1, len(title) + 1),
+            "title_id": title + 1,
+            "genre_id": (first[title] + within) % genres + 1,
+        }
+
+    def build_users(self):
+        return {
+            "id": self.ids("users"),
+            "username": "user{}",
+            "email": "user{}@yamdb.fake",
+            "role": "user",
+            "bio": "",
+            "first_name": "",
+            "last_name": "",
+        }
+
+    def build_review(self):
+        title, author = self.review_pairs()
+        size = len(title)
+        # Средняя оценка своя у каждого произведения.
+        quality = self.rng.normal(6.5, 1.5, self.sizes["titles"])
+        score = np.clip(
+            np.rint(quality[title] + self.rng.normal(0, 1.8, size)), 1, 10)
+        # Id растут со временем, как при обычной работе сервиса.
+        dates = self.dates_before(self.end_date, REVIEW_AGE_DAYS, size)
+        order = np.argsort(dates, kind="stable")
+        title, author, score = title[order], author[order], score[order]
+        self.review_dates = dates[order]
+        return {
+            "id": self.ids("review"),
+            "title_id": title + 1,
+            "text": "Отзыв {}",
+            "author": author + 1,
+            "score": score.astype(np.int64),
+            "pub_date": self.review_dates,
+        }
+
+    def build_comments(self):
+        size, reviews = self.sizes["comments"], self.sizes["review"]
+        self.get_table("review")
+        review = self.rng.integers(0, reviews, size)
+        author = self.sample_users(size)
+        delay = self.rng.exponential(
+            COMMENT_DELAY_DAYS * SECONDS_PER_DAY, size)
+        dates = np.minimum(
+            self.review_dates[review] + delay.astype("timedelta64[s]"),
+            self.end_date)
+        order = np.argsort(dates, kind="stable")
+        return {
+            "id": self.ids("comments"),
+            "review_id": review[order] + 1,
+            "text": "Комментарий {}",
+            "author": author[order] + 1,
+            "pub_date": dates[order],
+        }
+
+    def get_table(self, table):
+        if table not in self.tables:
+            self.tables[table] = getattr(self, f"build_{table}")()
+        return self.tables[table]
+
+    def iter_chunks(self, table, convert_dates):
+        """Порции строк-кортежей в порядке колонок EXPORT_TABLES."""
+        _, columns = EXPORT_TABLES[table]
+        data = self.get_table(table)
+        ids = data["id"]
+        for start in range(0, len(ids), CHUNK_SIZE):
+            chunk_ids = ids[start:start + CHUNK_SIZE].tolist()
+            values = []
+            for column in columns:
+                value = data[column]
+                if isinstance(value, str):
+                    values.append(
+                        [value.format(obj_id) for obj_id in chunk_ids]
+                        if "{}" in value else [value] * len(chunk_ids))
+                elif value.dtype.kind == "M":
+                    values.append(
+                        convert_dates(value[start:start + CHUNK_SIZE]))
+                else:
+                    values.append(value[start:start + CHUNK_SIZE].tolist())
+            yield list(zip(*values))
+
+    def write_csv(self, table, file):
+        writer = csv.writer(file)
+        writer.writerow(EXPORT_TABLES[table][1])
+        for rows in self.iter_chunks(
+                table,
+                lambda dates: np.datetime_as_string(dates, timezone="UTC")):
+            writer.writerows(rows)
+
+    def insert(self, table):
+        """
+        Вставка напрямую через executemany, минуя создание моделей.
+        Поля, которых нет в раскладке loadcsv, получают значения
+        по умолчанию.
+        """
+        Model, columns = EXPORT_TABLES[table]
+        fields = [Model._meta.get_field(get_field_name(column))
+                  for column in columns]
+        defaults = [
+            (field, field.get_db_prep_save(field.get_default(), connection))
+            for field in Model._meta.concrete_fields
+            if field not in fields
+        ]
+        sql = "INSERT INTO {} ({}) VALUES ({})".format(
+            connection.ops.quote_name(Model._meta.db_table),
+            ", ".join(connection.ops.quote_name(field.column)
+                      for field in fields + [f for f, _ in defaults]),
+            ", ".join(["%s"] * (len(fields) + len(defaults))),
+        )
+        default_values = tuple(value for _, value in defaults)
+
+        # Наивные значения в UTC: при USE_TZ бэкенды сохраняют их как есть.
+        adapt = connection.ops.adapt_datetimefield_value
+
+        def convert_dates(dates):
+            return [
+                adapt(value)
+                for value in dates.astype("datetime64[us]").tolist()
+            ]
+
+        with bulk_load_cache(), transaction.atomic(), \
+                connection.cursor() as cursor:
+            for rows in self.iter_chunks(table, convert_dates):
+                cursor.executemany(
+                    sql, [row + default_values for row in rows])
+        sequence_sql = connection.ops.sequence_reset_sql(
+            no_style(), [Model])
+        if sequence_sql:
+            with connection.cursor() as cursor:
+                for statement in sequence_sql:
+                    cursor.execute(statement)
@@ -0,0 +1,54 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from reviews.export import (
+    CHUNK_SIZE, CSV, EXPORT_TABLES, FORMATS, iter_export,
+)
+
+
+class Command(BaseCommand):
+    help = """Выгрузить таблицы в файлы table.csv (в формате loadcsv)
+        или table.ndjson. Пример: python3 manage.py exportcsv titles
+        review --output-dir dump. Без аргументов выгружаются все таблицы"""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "tables",
+            nargs="*",
+            help=f"Таблицы: {', '.join(EXPORT_TABLES)}",
+        )
+        parser.add_argument(
+            "--format",
+            choices=FORMATS,
+            default=CSV,
+            dest="export_format",
+            help="Формат файлов",
+        )
+        parser.add_argument(
+            "--output-dir",
+            default="export",
+            help="Каталог для файлов",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=CHUNK_SIZE,
+            help="Количество строк, читаемых из БД за раз",
+        )
+
+    def handle(self, *args, **options):
+        tables = options["tables"] or list(EXPORT_TABLES)
+        unknown = set(tables) - set(EXPORT_TABLES)
+        if unknown:
+            raise CommandError(
+                f"Неизвестные таблицы: {', '.join(sorted(unknown))}")
+        output_dir = Path(options["output_dir"])
+        output_dir.mkdir(parents=True, exist_ok=True)
+        export_format = options["export_format"]
+        for table in tables:
+            file_path = output_dir / f"{table}.{export_format}"
+            with open(file_path, "w", newline="", encoding="utf-8") as file:
+                file.writelines(iter_export(
+                    table, export_format, options["chunk_size"]))
+            self.stdout.write(f"Таблица {table} выгружена в {file_path}")
@@ -0,0 +1,104 @@
+import io
+import time
+from pathlib import Path
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from reviews.export import EXPORT_TABLES
+from reviews.generator import (
+    TITLE_EXPONENT, USER_EXPONENT, SyntheticDataset,
+)
+
+
+class Command(BaseCommand):
+    help = """Сгенерировать синтетические данные для нагрузочного
+        тестирования: напрямую в БД или в csv-файлы для loadcsv.
+        Пример: python3 manage.py generatedata --reviews 1000000
+        --output-dir generated; затем loadcsv --data-dir generated"""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reviews", type=int, default=10_000,
+            help="Количество отзывов")
+        parser.add_argument(
+            "--titles", type=int,
+            help="Количество произведений (по умолчанию reviews / 20)")
+        parser.add_argument(
+            "--users", type=int,
+            help="Количество пользователей (по умолчанию reviews / 5)")
+        parser.add_argument(
+            "--comments", type=int,
+            help="Количество комментариев (по умолчанию reviews / 3)")
+        parser.add_argument("--categories", type=int, default=10)
+        parser.add_argument("--genres", type=int, default=30)
+        parser.add_argument(
+            "--seed", type=int, default=0,
+            help="Зерно генератора случайных чисел")
+        parser.add_argument(
+            "--title-exponent", type=float, default=TITLE_EXPONENT,
+            help="Показатель закона Ципфа для популярности произведений")
+        parser.add_argument(
+            "--user-exponent", type=float, default=USER_EXPONENT,
+            help="Показатель степенного закона активности пользователей")
+        parser.add_argument(
+            "--end-date",
+            help="Дата самого позднего отзыва, ГГГГ-ММ-ДД "
+                 "(по умолчанию сегодня)")
+        parser.add_argument(
+            "--output-dir",
+            help="Записать csv-файлы в каталог вместо вставки в БД")
+
+    def get_dataset(self, options):
+        reviews = options["reviews"]
+        try:
+            return SyntheticDataset(
+                reviews=reviews,
+                titles=options["titles"] or max(reviews // 20, 1),
+                users=options["users"] or max(reviews // 5, 1),
+                comments=(options["comments"] if options["comments"]
+                          is not None else reviews // 3),
+                categories=options["categories"],
+                genres=options["genres"],
+                end_date=(options["end_date"]
+                          or timezone.now().date().isoformat()),
+                seed=options["seed"],
+                title_exponent=options["title_exponent"],
+                user_exponent=options["user_exponent"],
+            )
+        except ValueError as e:
+            raise CommandError(e)
+
+    def generate(self, dataset, table, output_dir):
+        if output_dir is None:
+            dataset.insert(table)
+            return
+        file_path = output_dir / f"{table}.csv"
+        with open(file_path, "w", newline="", encoding="utf-8") as file:
+            dataset.write_csv(table, file)
+
+    def handle(self, *args, **options):
+        output_dir = options["output_dir"]
+        if output_dir is not None:
+            output_dir = Path(output_dir)
+            output_dir.mkdir(parents=True, exist_ok=True)
+        elif any(Model.objects.exists()
+                 for Model, _ in EXPORT_TABLES.values()):
+            raise CommandError(
+                "База данных не пуста. Очистите её или укажите "
+                "--output-dir")
+        dataset = self.get_dataset(options)
+        for table in EXPORT_TABLES:
+            started = time.monotonic()
+            try:
+                self.generate(dataset, table, output_dir)
+            except ValueError as e:
+                raise CommandError(e)
+            rows = len(dataset.get_table(table)["id"])
+            self.stdout.write(
+                f"{table}: {rows} строк за "
+                f"{time.monotonic() - started:.1f} с")
+        if output_dir is None:
+            call_command("rebuildratings", stdout=io.StringIO())
+            call_command("rebuildsearch", stdout=io.StringIO())
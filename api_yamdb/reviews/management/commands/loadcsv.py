@@ -1,11 +1,19 @@
+from django.core.management import call_command
 from django.core.management.base import (
     BaseCommand,
     CommandError,
 )
-from django.shortcuts import get_object_or_404
 from django.apps import apps
 from django.conf import settings
+from django.db import connection, connections, transaction
+from django.utils import timezone
+from reviews.models import ImportCheckpoint
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+from pathlib import Path
 import csv
+import django
+import time
 
 
 FOREIGNKEY_FIELDS = ("category", "author", "genre", "title", "review")
@@ -19,15 +27,109 @@ FILE_NAMES = [
     "review.csv",
     "comments.csv",
 ]
+BATCH_SIZE = 5000
+# Отметки изменения, которые bulk_create и bulk_update не обновляют:
+# модель строк файла -> (поле со ссылкой на объект или None для самой
+# строки, отметка объекта). По ним строятся ETag и инкрементальные
+# пересчёты updatetrending и updatesimilar.
+CHANGE_STAMPS = {
+    "title": (None, "modified"),
+    "genretitle": ("title", "modified"),
+    "review": ("title", "reviews_modified"),
+    "comment": ("review", "comments_modified"),
+}
+
+
+class OffsetLines:
+    """
+    Строки бинарного файла для csv-ридера с подсчётом прочитанных байт.
+    Ридер не читает строки впрок, поэтому после каждой записи offset
+    указывает на начало следующей.
+    """
+
+    def __init__(self, file):
+        self.file = file
+        self.offset = file.tell()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        line = self.file.readline()
+        if not line:
+            raise StopIteration
+        self.offset += len(line)
+        return line.decode("utf-8")
+
+    def seek(self, offset):
+        self.file.seek(offset)
+        self.offset = offset
+
+
+def init_worker():
+    """Настройка Django в процессе-исполнителе (для метода spawn)."""
+    django.setup()
+
+
+def load_file(file_name, data_dir, batch_size, resume):
+    """
+    Загрузка одного файла в процессе-исполнителе.
+    Соединение с БД у каждого процесса своё.
+    """
+    command = Command()
+    command.data_dir = data_dir
+    command.batch_size = batch_size
+    command.resume = resume
+    command.id_maps = {}
+    return command.load_csv(file_name)
+
+
+def pop_ready(pending, done):
+    """Убирает из pending и возвращает файлы, все родители которых готовы."""
+    ready = [
+        file_name for file_name, parents in pending.items()
+        if parents <= done
+    ]
+    for file_name in ready:
+        del pending[file_name]
+    return ready
 
 
 class Command(BaseCommand):
     help = """Импортировать данные из файла model.csv в модель model.
-        Пример: python3 manage.py loadcsv title.csv.
-        Файлы моделей берутся из BASE_DIR / static / data"""
+        Пример: python3 manage.py loadcsv --data-dir generated.
+        По умолчанию файлы моделей берутся из BASE_DIR / static / data"""
+
+    data_dir = DATA_DIR
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--data-dir",
+            default=DATA_DIR,
+            help="Каталог с csv-файлами моделей",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=BATCH_SIZE,
+            help="Количество строк в одной транзакции bulk_create",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Количество процессов для параллельной загрузки файлов, "
+                 "не зависящих друг от друга",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Продолжить с позиции последней зафиксированной порции, "
+                 "пропуская полностью загруженные файлы",
+        )
 
     def get_csv_file(self, filename):
-        file_path = settings.BASE_DIR / "static" / "data" / filename
+        file_path = self.data_dir / filename
         return file_path
 
     def get_model_name(self, file_name):
@@ -45,29 +147,240 @@ class Command(BaseCommand):
             raise CommandError(f"Модели {Model} не существует")
         return Model
 
+    def get_foreign_key(self, column):
+        """Имя внешнего ключа для колонки csv или None."""
+        field = column[:-len("_id")] if column.endswith("_id") else column
+        if field in FOREIGNKEY_FIELDS:
+            return field
+        return None
+
+    def get_dependencies(self):
+        """
+        Граф зависимостей файлов: для каждого файла множество файлов,
+        на модели которых ссылаются его внешние ключи.
+        """
+        files_by_model = {
+            self.get_model(self.get_model_name(file_name)): file_name
+            for file_name in FILE_NAMES
+        }
+        dependencies = {}
+        for file_name in FILE_NAMES:
+            with open(self.get_csv_file(file_name), newline="") as file:
+                columns = next(csv.reader(file), [])
+            dependencies[file_name] = {
+                files_by_model[self.get_model(field)]
+                for field in map(self.get_foreign_key, columns)
+                if field is not None
+            }
+        return dependencies
+
+    def get_id_map(self, Model):
+        """
+        Множество существующих id модели.
+        Строится один раз на модель и пополняется при загрузке.
+        """
+        if Model not in self.id_maps:
+            self.id_maps[Model] = set(
+                Model.objects.values_list("id", flat=True).iterator())
+        return self.id_maps[Model]
+
+    def build_object(self, Model, row, foreign_keys, line_num):
+        Obj = Model()
+        for column, value in row.items():
+            field = foreign_keys[column]
+            if column == "id":
+                Obj.id = int(value)
+                continue
+            if field is None:
+                setattr(Obj, column, value)
+                continue
+            obj_id = int(value)
+            if obj_id not in self.get_id_map(self.get_model(field)):
+                raise CommandError(
+                    f"Строка {line_num}: объект {field} с id={value} "
+                    "не найден"
+                )
+            setattr(Obj, f"{field}_id", obj_id)
+        return Obj
+
+    def get_checkpoint(self, file_name, file_path):
+        """
+        Позиция загрузки файла. Без --resume или если файл изменился,
+        загрузка начинается сначала.
+        """
+        stat = file_path.stat()
+        checkpoint, _ = ImportCheckpoint.objects.get_or_create(
+            file_name=file_name,
+            defaults={"file_size": stat.st_size,
+                      "file_mtime": stat.st_mtime},
+        )
+        changed = (checkpoint.file_size, checkpoint.file_mtime) != (
+            stat.st_size, stat.st_mtime)
+        if not self.resume or changed:
+            checkpoint.file_size = stat.st_size
+            checkpoint.file_mtime = stat.st_mtime
+            checkpoint.offset = checkpoint.rows = 0
+            checkpoint.completed = False
+            checkpoint.save()
+        return checkpoint
+
+    def get_auto_date_fields(self, Model, field_names):
+        """Поля файла, которые bulk_create заполняет текущим временем."""
+        return [
+            field.name for field in Model._meta.concrete_fields
+            if field.name in field_names
+            and getattr(field, "auto_now_add", False)
+        ]
+
+    def touch_changed(self, Model, objects):
+        """Отмечает изменение объектов, которые затрагивают строки порции."""
+        stamp = CHANGE_STAMPS.get(Model._meta.model_name)
+        if stamp is None:
+            return
+        field_name, stamp_field = stamp
+        if field_name is None:
+            Parent, attname = Model, "pk"
+        else:
+            field = Model._meta.get_field(field_name)
+            Parent, attname = field.related_model, field.attname
+        Parent.objects.filter(
+            pk__in={getattr(obj, attname) for obj in objects},
+        ).update(**{stamp_field: timezone.now()})
+
+    def save_batch(self, Model, objects, update_fields, checkpoint):
+        """
+        Вставка новых и обновление существующих по id объектов
+        вместе с позицией загрузки в одной транзакции.
+        """
+        existing = self.get_id_map(Model)
+        new_objects = [obj for obj in objects if obj.id not in existing]
+        old_objects = [obj for obj in objects if obj.id in existing]
+        date_fields = self.get_auto_date_fields(Model, update_fields)
+        file_dates = [
+            [getattr(obj, field) for field in date_fields]
+            for obj in new_objects
+        ]
+        with transaction.atomic():
+            Model.objects.bulk_create(new_objects)
+            if new_objects and date_fields:
+                # bulk_create заменил даты из файла текущим временем.
+                for obj, values in zip(new_objects, file_dates):
+                    for field, value in zip(date_fields, values):
+                        setattr(obj, field, value)
+                Model.objects.bulk_update(new_objects, date_fields)
+            if old_objects and update_fields:
+                Model.objects.bulk_update(old_objects, update_fields)
+            self.touch_changed(Model, objects)
+            checkpoint.save()
+        existing.update(obj.id for obj in new_objects)
+
     def load_csv(self, file_name):
         model_name = self.get_model_name(file_name)
         file_path = self.get_csv_file(file_name)
         Model = self.get_model(model_name)
+        checkpoint = self.get_checkpoint(file_name, file_path)
+        if checkpoint.completed:
+            self.stdout.write(f"Файл {file_name} уже загружен")
+            return 0
         try:
-            with open(file_path) as file:
+            with open(file_path, "rb") as file:
                 self.stdout.write(f"Чтение файла {file_name}")
-                reader = csv.DictReader(file)
-                for row in reader:
-                    Obj = Model()
-                    for i, field in enumerate(row.values()):
-                        if reader.fieldnames[i] in FOREIGNKEY_FIELDS:
-                            model = self.get_model(reader.fieldnames[i])
-                            obj = get_object_or_404(model, id=field)
-                            setattr(Obj, reader.fieldnames[i], obj)
-                        else:
-                            setattr(Obj, reader.fieldnames[i], field)
-                    Obj.save()
+                lines = OffsetLines(file)
+                reader = csv.DictReader(lines)
+                foreign_keys = {
+                    column: self.get_foreign_key(column)
+                    for column in reader.fieldnames
+                }
+                update_fields = [
+                    foreign_keys[column] or column
+                    for column in reader.fieldnames if column != "id"
+                ]
+                if checkpoint.offset:
+                    lines.seek(checkpoint.offset)
+                    self.stdout.write(
+                        f"{file_name}: продолжение после "
+                        f"{checkpoint.rows} строк")
+                total = 0
+                started = time.monotonic()
+                while True:
+                    objects = [
+                        self.build_object(
+                            Model, row, foreign_keys, reader.line_num)
+                        for row in islice(reader, self.batch_size)
+                    ]
+                    if not objects:
+                        break
+                    checkpoint.offset = lines.offset
+                    checkpoint.rows += len(objects)
+                    self.save_batch(Model, objects, update_fields, checkpoint)
+                    total += len(objects)
+                    elapsed = time.monotonic() - started
+                    self.stdout.write(
+                        f"{file_name}: {total} строк, "
+                        f"{total / elapsed if elapsed else total:.0f} строк/с"
+                    )
+                checkpoint.completed = True
+                checkpoint.save()
+                return total
         except Exception as e:
             raise CommandError(
                 f"При чтении файла {file_name} произошла ошибка: {e}"
             )
 
+    def load_sequential(self, dependencies):
+        pending, done = dict(dependencies), set()
+        while pending:
+            ready = pop_ready(pending, done)
+            if not ready:
+                raise CommandError(
+                    f"Циклическая зависимость файлов: {', '.join(pending)}")
+            for file_name in ready:
+                self.load_csv(file_name)
+                done.add(file_name)
+
+    def load_parallel(self, dependencies, workers):
+        """
+        Файлы запускаются, как только загружены все их родители.
+        Соединения закрываются до запуска процессов, чтобы исполнители
+        не унаследовали открытое соединение родителя.
+        """
+        pending, done, running = dict(dependencies), set(), {}
+        connections.close_all()
+        with ProcessPoolExecutor(
+                max_workers=workers, initializer=init_worker) as executor:
+            while pending or running:
+                for file_name in pop_ready(pending, done):
+                    running[executor.submit(
+                        load_file, file_name, self.data_dir,
+                        self.batch_size, self.resume)] = file_name
+                if not running:
+                    raise CommandError(
+                        "Циклическая зависимость файлов: "
+                        f"{', '.join(pending)}")
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    file_name = running.pop(future)
+                    total = future.result()
+                    done.add(file_name)
+                    self.stdout.write(
+                        f"Файл {file_name} загружен: {total} строк")
+
     def handle(self, *args, **options):
-        for file_name in FILE_NAMES:
-            self.load_csv(file_name)
+        self.data_dir = Path(options["data_dir"])
+        self.batch_size = options["batch_size"]
+        self.resume = options["resume"]
+        self.id_maps = {}
+        workers = options["workers"]
+        if workers > 1 and connection.vendor == "sqlite" and (
+                connection.is_in_memory_db()):
+            self.stderr.write(
+                "База SQLite в памяти недоступна другим процессам, "
+                "файлы будут загружены последовательно")
+            workers = 1
+        dependencies = self.get_dependencies()
+        if workers > 1:
+            self.load_parallel(dependencies, workers)
+        else:
+            self.load_sequential(dependencies)
+        call_command("rebuildratings", stdout=self.stdout)
+        call_command("rebuildsearch", stdout=self.stdout)
@@ -0,0 +1,56 @@
+from functools import reduce
+from operator import or_
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from api.cache import invalidate_catalog
+from api_yamdb.constants import ZERO
+from reviews.models import SCORE_FIELDS, Review, Title
+
+
+class Command(BaseCommand):
+    help = """Пересчитать сохранённые рейтинги и гистограммы оценок.
+        Пример: python3 manage.py rebuildratings"""
+
+    def get_counters(self):
+        """Выражения для пересчёта счётчиков по отзывам произведения."""
+        reviews = Review.objects.filter(
+            title=OuterRef("pk")).order_by().values("title")
+        return {
+            "rating_sum": Coalesce(Subquery(
+                reviews.annotate(total=Sum("score")).values("total")),
+                ZERO),
+            "rating_count": Coalesce(Subquery(
+                reviews.annotate(total=Count("pk")).values("total")),
+                ZERO),
+            **{
+                field: Coalesce(Subquery(
+                    reviews.filter(score=score).annotate(
+                        total=Count("pk")).values("total")),
+                    ZERO)
+                for score, field in SCORE_FIELDS.items()
+            },
+        }
+
+    def handle(self, *args, **options):
+        counters = self.get_counters()
+        # Обновляются только произведения с изменившимися счётчиками:
+        # вместе с ними меняются отметки, по которым строятся ETag
+        # и инкрементальные пересчёты updatetrending и updatesimilar.
+        stale = Title.objects.annotate(**{
+            f"new_{field}": counter for field, counter in counters.items()
+        }).filter(reduce(or_, (
+            ~Q(**{field: F(f"new_{field}")}) for field in counters
+        ))).values("pk")
+        now = timezone.now()
+        with transaction.atomic():
+            updated = Title.objects.filter(pk__in=Subquery(stale)).update(
+                **counters, modified=now, reviews_modified=now)
+            if updated:
+                # Обновление минует сигналы, сбрасывающие кеш каталога.
+                transaction.on_commit(invalidate_catalog)
+        self.stdout.write(f"Пересчитаны рейтинги {updated} произведений")
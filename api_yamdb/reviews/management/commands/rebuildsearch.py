@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = """Перестроить поисковый индекс произведений.
+        Пример: python3 manage.py rebuildsearch"""
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            get_search_backend().rebuild()
+        self.stdout.write("Поисковый индекс произведений перестроен")
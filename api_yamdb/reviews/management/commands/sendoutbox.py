@@ -0,0 +1,61 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from reviews.outbox import pending_emails, queue_depth, send_emails
+
+BATCH_SIZE = 100
+POLL_INTERVAL = 5
+
+
+class Command(BaseCommand):
+    help = """Отправить письма из очереди исходящих писем.
+        Пример: python3 manage.py sendoutbox --loop"""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=BATCH_SIZE,
+            help="Количество писем, отправляемых через одно соединение",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Не завершаться, а опрашивать очередь",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=POLL_INTERVAL,
+            help="Пауза между опросами пустой очереди, секунды",
+        )
+        parser.add_argument(
+            "--depth",
+            action="store_true",
+            help="Только вывести количество писем в очереди",
+        )
+
+    def drain(self, batch_size):
+        total_sent = total_failed = 0
+        while True:
+            sent, failed = send_emails(pending_emails()[:batch_size])
+            total_sent += sent
+            total_failed += failed
+            if sent + failed < batch_size:
+                return total_sent, total_failed
+
+    def handle(self, *args, **options):
+        if options["depth"]:
+            self.stdout.write(str(queue_depth()))
+            return
+        while True:
+            sent, failed = self.drain(options["batch_size"])
+            if sent or failed:
+                self.stdout.write(
+                    f"Отправлено: {sent}, ошибок: {failed}, "
+                    f"в очереди: {queue_depth()}"
+                )
+            if not options["loop"]:
+                return
+            time.sleep(options["interval"])
@@ -0,0 +1,41 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from reviews.similarity import ADJUSTED_COSINE, COSINE, update_similar
+
+
+class Command(BaseCommand):
+    help = """Пересчитать похожие произведения по оценкам пользователей.
+        Пересчитываются только произведения, отзывы которых изменились
+        с прошлого запуска. Пример: python3 manage.py updatesimilar"""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Пересчитать все произведения",
+        )
+        parser.add_argument(
+            "--method",
+            choices=(ADJUSTED_COSINE, COSINE),
+            default=ADJUSTED_COSINE,
+            help="Мера сходства",
+        )
+        parser.add_argument(
+            "--count",
+            type=int,
+            help="Количество похожих произведений на одно произведение",
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        updated = update_similar(
+            full=options["full"],
+            method=options["method"],
+            count=options["count"],
+        )
+        self.stdout.write(
+            f"Пересчитано произведений: {updated} "
+            f"за {time.monotonic() - started:.1f} с"
+        )
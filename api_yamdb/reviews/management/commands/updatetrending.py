@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from reviews.trending import update_trending
+
+
+class Command(BaseCommand):
+    help = """Пересчитать популярность произведений по свежим отзывам.
+        Пересчитываются только произведения, отзывы которых изменились
+        с прошлого запуска. Пример: python3 manage.py updatetrending"""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Пересчитать все произведения",
+        )
+
+    def handle(self, *args, **options):
+        updated, removed = update_trending(full=options["full"])
+        self.stdout.write(
+            f"Пересчитано произведений: {updated}, "
+            f"удалено из рейтинга: {removed}"
+        )
@@ -0,0 +1,27 @@
+# Generated by Django 3.2 on 2026-10-18 02:43
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0008_score_histogram'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TitleTrend',
+            fields=[
+                ('title', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='trend', serialize=False, to='reviews.title', verbose_name='Произведение')),
+                ('score', models.FloatField(db_index=True, verbose_name='Популярность')),
+                ('computed_at', models.DateTimeField(db_index=True, verbose_name='Дата расчёта')),
+            ],
+            options={
+                'verbose_name': 'Популярность произведения',
+                'verbose_name_plural': 'Популярность произведений',
+                'ordering': ('-score',),
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 3.2 on 2026-10-18 02:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0010_similar_title'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('file_name', models.CharField(max_length=256, unique=True, verbose_name='Файл')),
+                ('file_size', models.PositiveBigIntegerField(verbose_name='Размер файла')),
+                ('file_mtime', models.FloatField(verbose_name='Время изменения файла')),
+                ('offset', models.PositiveBigIntegerField(default=0, verbose_name='Смещение в байтах')),
+                ('rows', models.PositiveBigIntegerField(default=0, verbose_name='Загружено строк')),
+                ('completed', models.BooleanField(default=False, verbose_name='Загружен')),
+                ('updated', models.DateTimeField(auto_now=True, verbose_name='Обновлено')),
+            ],
+            options={
+                'verbose_name': 'Позиция загрузки',
+                'verbose_name_plural': 'Позиции загрузки',
+                'ordering': ('file_name',),
+            },
+        ),
+    ]
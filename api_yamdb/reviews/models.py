@@ -1,11 +1,25 @@
 from django.utils import timezone
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.db.models import F
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.db.models import UniqueConstraint
 from api_yamdb.constants import (NAME_LENGTH, SLUG_LENGTH, LENGHT_FOR_USER,
                                  EMAIL_LENGTH, ROLE_LENGTH,
-                                 MIN_SCORE, MAX_SCORE, COUNT)
+                                 MIN_SCORE, MAX_SCORE, COUNT, ZERO)
+
+
+SCORE_FIELDS = {
+    score: f"score_{score}" for score in range(MIN_SCORE, MAX_SCORE + 1)
+}
+
+
+def score_counter(score):
+    return models.PositiveIntegerField(
+        verbose_name=f"Количество оценок {score}",
+        default=ZERO,
+        editable=False,
+    )
 
 
 class CategoryAndGenre(models.Model):
@@ -66,15 +80,100 @@ class Title(models.Model):
         null=True,
         related_name="titles",
     )
+    rating_sum = models.PositiveIntegerField(
+        verbose_name="Сумма оценок",
+        default=ZERO,
+        editable=False,
+    )
+    rating_count = models.PositiveIntegerField(
+        verbose_name="Количество оценок",
+        default=ZERO,
+        editable=False,
+    )
+    modified = models.DateTimeField(
+        verbose_name="Дата изменения",
+        default=timezone.now,
+        editable=False,
+    )
+    reviews_modified = models.DateTimeField(
+        verbose_name="Дата изменения отзывов",
+        default=timezone.now,
+        editable=False,
+    )
+    score_1 = score_counter(1)
+    score_2 = score_counter(2)
+    score_3 = score_counter(3)
+    score_4 = score_counter(4)
+    score_5 = score_counter(5)
+    score_6 = score_counter(6)
+    score_7 = score_counter(7)
+    score_8 = score_counter(8)
+    score_9 = score_counter(9)
+    score_10 = score_counter(10)
 
     class Meta:
         ordering = ("name",)
         verbose_name = "Произведение"
         verbose_name_plural = "Произведения"
+        indexes = [
+            models.Index(fields=["name", "id"], name="title_name_id_idx"),
+        ]
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        self.modified = timezone.now()
+        super().save(*args, **kwargs)
+
+    @property
+    def rating(self):
+        """Целочисленная средняя оценка или None, если отзывов нет."""
+        if not self.rating_count:
+            return None
+        return self.rating_sum // self.rating_count
+
+    @property
+    def average_score(self):
+        """Точная средняя оценка или None, если отзывов нет."""
+        if not self.rating_count:
+            return None
+        return self.rating_sum / self.rating_count
+
+    @property
+    def score_histogram(self):
+        """Количество отзывов с каждой оценкой от MIN_SCORE до MAX_SCORE."""
+        return {
+            score: getattr(self, field)
+            for score, field in SCORE_FIELDS.items()
+        }
+
+    def change_score(self, new_score=None, old_score=None):
+        """
+        Атомарно обновляет сохранённые сумму, количество и гистограмму
+        оценок и отметку изменения отзывов произведения.
+        new_score без old_score - добавление отзыва,
+        old_score без new_score - удаление, оба значения - изменение отзыва.
+        """
+        now = timezone.now()
+        changes = {"reviews_modified": now}
+        delta_sum = (new_score or ZERO) - (old_score or ZERO)
+        delta_count = (new_score is not None) - (old_score is not None)
+        if delta_sum:
+            changes["rating_sum"] = F("rating_sum") + delta_sum
+        if delta_count:
+            changes["rating_count"] = F("rating_count") + delta_count
+        if new_score != old_score:
+            if new_score is not None:
+                field = SCORE_FIELDS[new_score]
+                changes[field] = F(field) + 1
+            if old_score is not None:
+                field = SCORE_FIELDS[old_score]
+                changes[field] = F(field) - 1
+        if delta_sum or delta_count:
+            changes["modified"] = now
+        Title.objects.filter(pk=self.pk).update(**changes)
+
 
 class GenreTitle(models.Model):
     genre = models.ForeignKey(Genre, on_delete=models.CASCADE)
@@ -165,6 +264,11 @@ class Review(BaseAuthorModel):
                               message="Нельзя поставить оценку выше 10."),
         ]
     )
+    comments_modified = models.DateTimeField(
+        verbose_name="Дата изменения комментариев",
+        default=timezone.now,
+        editable=False,
+    )
 
     class Meta(BaseAuthorModel.Meta):
 
@@ -176,10 +280,34 @@ class Review(BaseAuthorModel):
                 name='unique_review_per_user_title'
             )
         ]
+        indexes = [
+            models.Index(
+                fields=["title", "-pub_date", "-id"],
+                name="review_title_pub_date_idx",
+            ),
+        ]
+
+    # Оценка и произведение, сохранённые в БД: по ним сигналы
+    # пересчитывают счётчики произведений при изменении и удалении отзыва.
+    loaded_score = None
+    loaded_title_id = None
 
     def __str__(self):
         return self.text[:COUNT]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        loaded = dict(zip(field_names, values))
+        instance.loaded_score = loaded.get("score")
+        instance.loaded_title_id = loaded.get("title_id")
+        return instance
+
+    def touch_comments(self):
+        """Отмечает изменение комментариев к отзыву."""
+        Review.objects.filter(pk=self.pk).update(
+            comments_modified=timezone.now())
+
 
 class Comment(BaseAuthorModel):
     """Модель комментариев"""
@@ -199,6 +327,132 @@ class Comment(BaseAuthorModel):
     class Meta(BaseAuthorModel.Meta):
         verbose_name = "Комментарий"
         verbose_name_plural = "Комментарии"
+        indexes = [
+            models.Index(
+                fields=["review", "-pub_date", "-id"],
+                name="comment_review_pub_date_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.text[:COUNT]
+
+
+class OutgoingEmail(models.Model):
+    """Письмо в очереди на отправку"""
+    subject = models.CharField(verbose_name="Тема", max_length=NAME_LENGTH)
+    body = models.TextField(verbose_name="Текст")
+    from_email = models.EmailField(
+        verbose_name="Отправитель", max_length=EMAIL_LENGTH)
+    recipient = models.EmailField(
+        verbose_name="Получатель", max_length=EMAIL_LENGTH)
+    created = models.DateTimeField("Дата добавления", auto_now_add=True)
+    attempts = models.PositiveSmallIntegerField(
+        verbose_name="Попытки отправки", default=ZERO)
+    next_attempt_at = models.DateTimeField(
+        verbose_name="Следующая попытка", default=timezone.now)
+    sent_at = models.DateTimeField(
+        verbose_name="Дата отправки", blank=True, null=True)
+    last_error = models.TextField(verbose_name="Последняя ошибка", blank=True)
+
+    class Meta:
+        ordering = ("next_attempt_at",)
+        verbose_name = "Исходящее письмо"
+        verbose_name_plural = "Исходящие письма"
+        indexes = [
+            models.Index(
+                fields=["sent_at", "next_attempt_at"],
+                name="outgoing_email_pending_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.recipient}: {self.subject}"
+
+
+class TitleTrend(models.Model):
+    """
+    Популярность произведения: логарифм суммы exp(ln2 * t / T)
+    по отзывам, где t - время отзыва от фиксированной эпохи,
+    T - период полураспада. Сравнение таких значений равносильно
+    сравнению затухающих сумм в любой момент времени.
+    """
+    title = models.OneToOneField(
+        Title,
+        verbose_name="Произведение",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="trend",
+    )
+    score = models.FloatField(verbose_name="Популярность", db_index=True)
+    computed_at = models.DateTimeField(
+        verbose_name="Дата расчёта", db_index=True)
+
+    class Meta:
+        ordering = ("-score",)
+        verbose_name = "Популярность произведения"
+        verbose_name_plural = "Популярность произведений"
+
+    def __str__(self):
+        return f"{self.title}: {self.score:.3f}"
+
+
+class SimilarTitle(models.Model):
+    """Похожее произведение по оценкам пользователей"""
+    title = models.ForeignKey(
+        Title,
+        verbose_name="Произведение",
+        on_delete=models.CASCADE,
+        related_name="similar_titles",
+    )
+    similar = models.ForeignKey(
+        Title,
+        verbose_name="Похожее произведение",
+        on_delete=models.CASCADE,
+        related_name="similar_of",
+    )
+    score = models.FloatField(verbose_name="Сходство")
+    computed_at = models.DateTimeField(
+        verbose_name="Дата расчёта", db_index=True)
+
+    class Meta:
+        ordering = ("-score",)
+        verbose_name = "Похожее произведение"
+        verbose_name_plural = "Похожие произведения"
+        constraints = [
+            UniqueConstraint(
+                fields=["title", "similar"],
+                name="unique_similar_title",
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["title", "-score"],
+                name="similar_title_score_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.title} ~ {self.similar}: {self.score:.3f}"
+
+
+class ImportCheckpoint(models.Model):
+    """Позиция, до которой файл loadcsv загружен и зафиксирован"""
+    file_name = models.CharField(
+        verbose_name="Файл", max_length=NAME_LENGTH, unique=True)
+    file_size = models.PositiveBigIntegerField(verbose_name="Размер файла")
+    file_mtime = models.FloatField(verbose_name="Время изменения файла")
+    offset = models.PositiveBigIntegerField(
+        verbose_name="Смещение в байтах", default=ZERO)
+    rows = models.PositiveBigIntegerField(
+        verbose_name="Загружено строк", default=ZERO)
+    completed = models.BooleanField(verbose_name="Загружен", default=False)
+    updated = models.DateTimeField(verbose_name="Обновлено", auto_now=True)
+
+    class Meta:
+        ordering = ("file_name",)
+        verbose_name = "Позиция загрузки"
+        verbose_name_plural = "Позиции загрузки"
+
+    def __str__(self):
+        return f"{self.file_name}: {self.rows}"
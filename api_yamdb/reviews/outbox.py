@@ -0,0 +1,96 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from api_yamdb.metrics import EMAILS
+from reviews.models import OutgoingEmail
+
+
+def enqueue_email(subject, body, from_email, recipient):
+    """
+    Ставит письмо в очередь. При EMAIL_OUTBOX_EAGER письмо отправляется
+    сразу после коммита транзакции (для разработки и тестов).
+    """
+    email = OutgoingEmail.objects.create(
+        subject=subject,
+        body=body,
+        from_email=from_email,
+        recipient=recipient,
+    )
+    if settings.EMAIL_OUTBOX_EAGER:
+        transaction.on_commit(
+            lambda: send_emails(OutgoingEmail.objects.filter(pk=email.pk)))
+    return email
+
+
+def pending_emails():
+    """Неотправленные письма, для которых подошло время попытки."""
+    return OutgoingEmail.objects.filter(
+        sent_at__isnull=True,
+        next_attempt_at__lte=timezone.now(),
+        attempts__lt=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+    )
+
+
+def queue_depth():
+    """Количество писем, ожидающих отправки, включая отложенные."""
+    return OutgoingEmail.objects.filter(
+        sent_at__isnull=True,
+        attempts__lt=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+    ).count()
+
+
+def schedule_retry(email, error):
+    email.attempts += 1
+    email.last_error = str(error)
+    email.next_attempt_at = timezone.now() + timedelta(
+        seconds=settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (email.attempts - 1))
+
+
+def send_emails(emails):
+    """
+    Отправляет письма через одно SMTP-соединение.
+    Неудачные попытки откладываются с экспоненциальной задержкой.
+    Возвращает пару (отправлено, ошибок).
+    """
+    emails = list(emails)
+    if not emails:
+        return 0, 0
+    sent, failed = [], []
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as e:
+        for email in emails:
+            schedule_retry(email, e)
+        failed = emails
+    else:
+        try:
+            for email in emails:
+                message = EmailMessage(
+                    email.subject,
+                    email.body,
+                    email.from_email,
+                    [email.recipient],
+                    connection=connection,
+                )
+                try:
+                    message.send()
+                except Exception as e:
+                    schedule_retry(email, e)
+                    failed.append(email)
+                else:
+                    email.attempts += 1
+                    email.sent_at = timezone.now()
+                    sent.append(email)
+        finally:
+            connection.close()
+    OutgoingEmail.objects.bulk_update(sent, ("attempts", "sent_at"))
+    OutgoingEmail.objects.bulk_update(
+        failed, ("attempts", "last_error", "next_attempt_at"))
+    EMAILS.labels("sent").inc(len(sent))
+    EMAILS.labels("failed").inc(len(failed))
+    return len(sent), len(failed)
@@ -0,0 +1,94 @@
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from django.utils.module_loading import import_string
+
+FTS_TABLE = "reviews_title_fts"
+# Веса bm25 для колонок name и description.
+NAME_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+
+
+class TitleSearchBackend:
+    """
+    Поиск по названию и описанию без индекса.
+    Базовый класс для движков полнотекстового поиска.
+    """
+
+    def search(self, queryset, query):
+        return queryset.filter(
+            Q(name__icontains=query) | Q(description__icontains=query))
+
+    def index(self, title):
+        pass
+
+    def remove(self, title):
+        pass
+
+    def rebuild(self):
+        pass
+
+
+class SQLiteFTSBackend(TitleSearchBackend):
+    """Поиск через виртуальную таблицу FTS5 с ранжированием bm25."""
+
+    def get_match_query(self, query):
+        # Каждое слово - префиксный запрос в кавычках, слова через AND.
+        words = re.findall(r"\w+", query)
+        return " ".join(f'"{word}"*' for word in words)
+
+    def search(self, queryset, query):
+        match = self.get_match_query(query)
+        if not match:
+            return queryset.none()
+        # Таблица FTS читается один раз: соединение по rowid с одним
+        # MATCH, ранг bm25 берётся из той же строки соединения.
+        return queryset.extra(
+            tables=[FTS_TABLE],
+            where=[
+                f"{FTS_TABLE}.rowid = {queryset.model._meta.db_table}.id",
+                f"{FTS_TABLE} MATCH %s",
+            ],
+            params=[match],
+            select={"search_rank": f"bm25({FTS_TABLE}, %s, %s)"},
+            select_params=(NAME_WEIGHT, DESCRIPTION_WEIGHT),
+        ).order_by("search_rank", "name")
+
+    def index(self, title):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT OR REPLACE INTO {FTS_TABLE} "
+                "(rowid, name, description) VALUES (%s, %s, %s)",
+                (title.pk, title.name, title.description),
+            )
+
+    def remove(self, title):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", (title.pk,))
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE}")
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} (rowid, name, description) "
+                "SELECT id, name, description FROM reviews_title"
+            )
+
+
+VENDOR_BACKENDS = {
+    "sqlite": SQLiteFTSBackend,
+}
+
+
+def get_search_backend():
+    """
+    Движок поиска из настройки TITLE_SEARCH_BACKEND,
+    иначе движок для текущей СУБД.
+    """
+    path = getattr(settings, "TITLE_SEARCH_BACKEND", None)
+    if path:
+        return import_string(path)()
+    return VENDOR_BACKENDS.get(connection.vendor, TitleSearchBackend)()
@@ -0,0 +1,101 @@
+from contextvars import ContextVar
+
+from django.db.models.signals import (
+    post_delete, post_save, pre_delete, pre_save,
+)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.search import get_search_backend
+
+# id удаляемых сейчас произведений и отзывов по моделям.
+deleting = ContextVar("deleting", default=None)
+
+
+def get_deleting(Model):
+    marks = deleting.get()
+    if marks is None:
+        marks = {Title: set(), Review: set()}
+        deleting.set(marks)
+    return marks[Model]
+
+
+@receiver(post_save, sender=Title)
+def index_title(sender, instance, **kwargs):
+    get_search_backend().index(instance)
+
+
+@receiver(post_delete, sender=Title)
+def remove_title_from_index(sender, instance, **kwargs):
+    get_search_backend().remove(instance)
+
+
+@receiver(pre_delete, sender=Category)
+@receiver(pre_delete, sender=Genre)
+def touch_titles_of_deleted_group(sender, instance, **kwargs):
+    """Удаление категории или жанра меняет представление произведений."""
+    instance.titles.update(modified=timezone.now())
+
+
+@receiver(pre_save, sender=Review)
+def remember_review_score(sender, instance, **kwargs):
+    """Прежние оценка и произведение отзыва, созданного в памяти."""
+    if instance.pk is not None and instance.loaded_score is None:
+        instance.loaded_score, instance.loaded_title_id = (
+            Review.objects.filter(pk=instance.pk).values_list(
+                "score", "title_id").first() or (None, None))
+
+
+@receiver(post_save, sender=Review)
+def count_saved_review(sender, instance, created, **kwargs):
+    """
+    Счётчики оценок и отметка изменения отзывов произведения.
+    Сигналы, а не представления: так учитываются и админка,
+    и каскадное удаление отзывов вместе с пользователем.
+    """
+    old_title_id = instance.loaded_title_id
+    if created or old_title_id in (None, instance.title_id):
+        Title(pk=instance.title_id).change_score(
+            new_score=instance.score,
+            old_score=None if created else instance.loaded_score)
+    else:
+        # Отзыв перенесён в другое произведение (например, в админке).
+        Title(pk=old_title_id).change_score(old_score=instance.loaded_score)
+        Title(pk=instance.title_id).change_score(new_score=instance.score)
+    instance.loaded_score = instance.score
+    instance.loaded_title_id = instance.title_id
+
+
+@receiver(pre_delete, sender=Title)
+@receiver(pre_delete, sender=Review)
+def mark_deleting(sender, instance, **kwargs):
+    """
+    Collector рассылает pre_delete до удаления строк, поэтому отзывы
+    и комментарии удаляемого родителя видят отметку и не обновляют
+    его счётчики по одному UPDATE на строку.
+    """
+    get_deleting(sender).add(instance.pk)
+
+
+@receiver(post_delete, sender=Review)
+def count_deleted_review(sender, instance, **kwargs):
+    get_deleting(Review).discard(instance.pk)
+    title_id = instance.loaded_title_id or instance.title_id
+    if title_id in get_deleting(Title):
+        return
+    old_score = instance.loaded_score
+    Title(pk=title_id).change_score(
+        old_score=instance.score if old_score is None else old_score)
+
+
+@receiver(post_delete, sender=Title)
+def unmark_deleted_title(sender, instance, **kwargs):
+    get_deleting(Title).discard(instance.pk)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def touch_review_comments(sender, instance, **kwargs):
+    if instance.review_id not in get_deleting(Review):
+        Review(pk=instance.review_id).touch_comments()
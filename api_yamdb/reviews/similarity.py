@@ -0,0 +1,172 @@
+"""
+Пакетный расчёт похожих произведений по матрице оценок
+пользователь x произведение (item-based collaborative filtering).
+"""
+from itertools import chain
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from reviews.models import Review, SimilarTitle, Title
+
+ADJUSTED_COSINE = "adjusted-cosine"
+COSINE = "cosine"
+# Ограничения памяти: плотный блок сходств chunk x n_titles (float64)
+# и число промежуточных произведений оценок за один проход.
+BLOCK_BYTES = 128 * 1024 * 1024
+MAX_PRODUCTS = 5_000_000
+READ_CHUNK_SIZE = 10_000
+# Не больше стольких произведений в одной транзакции записи.
+WRITE_CHUNK_SIZE = 500
+
+
+def concat_ranges(starts, lengths):
+    """Конкатенация диапазонов [start, start + length) без цикла."""
+    offsets = np.arange(lengths.sum()) - np.repeat(
+        np.cumsum(lengths) - lengths, lengths)
+    return np.repeat(starts, lengths) + offsets
+
+
+class RatingMatrix:
+    """
+    Разреженная матрица оценок в двух CSR-представлениях:
+    по произведениям (строки) и по пользователям.
+    """
+
+    def __init__(self, authors, titles, scores, method=ADJUSTED_COSINE):
+        self.title_ids, title_index = np.unique(titles, return_inverse=True)
+        _, user_index = np.unique(authors, return_inverse=True)
+        values = scores.astype(np.float64)
+        if method == ADJUSTED_COSINE:
+            user_sums = np.bincount(user_index, weights=values)
+            user_counts = np.bincount(user_index)
+            values = values - (user_sums / user_counts)[user_index]
+        self.n_titles = len(self.title_ids)
+
+        order = np.argsort(title_index, kind="stable")
+        self.item_users = user_index[order]
+        self.item_values = values[order]
+        self.item_ptr = np.concatenate(
+            ([0], np.cumsum(np.bincount(title_index,
+                                        minlength=self.n_titles))))
+
+        order = np.argsort(user_index, kind="stable")
+        self.user_items = title_index[order]
+        self.user_values = values[order]
+        self.user_degree = np.bincount(user_index)
+        self.user_ptr = np.concatenate(([0], np.cumsum(self.user_degree)))
+
+        self.norms = np.sqrt(np.bincount(
+            title_index, weights=values ** 2, minlength=self.n_titles))
+
+    @classmethod
+    def from_reviews(cls, method=ADJUSTED_COSINE):
+        rows = Review.objects.order_by().values_list(
+            "author_id", "title_id", "score")
+        data = np.fromiter(
+            chain.from_iterable(rows.iterator(chunk_size=READ_CHUNK_SIZE)),
+            dtype=np.int64,
+        ).reshape(-1, 3)
+        return cls(data[:, 0], data[:, 1], data[:, 2], method=method)
+
+    def dot_block(self, rows):
+        """
+        Скалярные произведения строк rows со всеми произведениями:
+        плотный блок len(rows) x n_titles.
+        """
+        block = np.zeros(len(rows) * self.n_titles)
+        lengths = self.item_ptr[rows + 1] - self.item_ptr[rows]
+        local = np.repeat(np.arange(len(rows)), lengths)
+        positions = concat_ranges(self.item_ptr[rows], lengths)
+        users = self.item_users[positions]
+        values = self.item_values[positions]
+        degree = self.user_degree[users]
+        total = np.cumsum(degree)
+        bounds = np.searchsorted(
+            total, np.arange(MAX_PRODUCTS, total[-1] if len(total) else 0,
+                             MAX_PRODUCTS), side="right")
+        for part in np.split(np.arange(len(users)), bounds):
+            if not len(part):
+                continue
+            rep = np.repeat(part, degree[part])
+            neighbours = concat_ranges(
+                self.user_ptr[users[part]], degree[part])
+            keys = local[rep] * self.n_titles + self.user_items[neighbours]
+            block += np.bincount(
+                keys,
+                weights=values[rep] * self.user_values[neighbours],
+                minlength=len(block),
+            )
+        return block.reshape(len(rows), self.n_titles)
+
+    def top_similar(self, rows, count):
+        """Тройки (строка, соседи, сходства) с лучшими count соседями."""
+        block = self.dot_block(rows)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            block /= self.norms[rows][:, None] * self.norms[None, :]
+        block[~np.isfinite(block)] = 0
+        block[np.arange(len(rows)), rows] = 0
+        count = min(count, self.n_titles - 1)
+        if count <= 0:
+            return
+        best = np.argpartition(-block, count - 1, axis=1)[:, :count]
+        for row, neighbours, similarities in zip(
+                rows, best, np.take_along_axis(block, best, axis=1)):
+            order = np.argsort(-similarities)
+            positive = similarities[order] > 0
+            yield row, neighbours[order][positive], similarities[order][
+                positive]
+
+
+def get_changed_title_ids(since):
+    titles = Title.objects.all()
+    if since is not None:
+        titles = titles.filter(reviews_modified__gte=since)
+    return titles.values_list("id", flat=True)
+
+
+def update_similar(full=False, method=ADJUSTED_COSINE, count=None):
+    """
+    Пересчитывает похожие произведения для изменившихся с прошлого
+    запуска произведений (или для всех при full=True).
+    Возвращает количество пересчитанных произведений.
+    """
+    started = timezone.now()
+    count = count or settings.SIMILAR_TITLES_COUNT
+    since = None
+    if not full:
+        since = SimilarTitle.objects.aggregate(
+            last=Max("computed_at"))["last"]
+    matrix = RatingMatrix.from_reviews(method=method)
+    changed = np.fromiter(get_changed_title_ids(since), dtype=np.int64)
+    # Произведения без отзывов теряют список похожих.
+    without_reviews = np.setdiff1d(changed, matrix.title_ids)
+    for offset in range(0, len(without_reviews), WRITE_CHUNK_SIZE):
+        SimilarTitle.objects.filter(title_id__in=without_reviews[
+            offset:offset + WRITE_CHUNK_SIZE].tolist()).delete()
+    if not matrix.n_titles:
+        return 0
+    rows = np.flatnonzero(np.isin(matrix.title_ids, changed))
+    chunk_size = max(1, min(
+        WRITE_CHUNK_SIZE, BLOCK_BYTES // (matrix.n_titles * 8)))
+    for offset in range(0, len(rows), chunk_size):
+        chunk = rows[offset:offset + chunk_size]
+        objects = [
+            SimilarTitle(
+                title_id=int(matrix.title_ids[row]),
+                similar_id=int(matrix.title_ids[neighbour]),
+                score=float(similarity),
+                computed_at=started,
+            )
+            for row, neighbours, similarities in matrix.top_similar(
+                chunk, count)
+            for neighbour, similarity in zip(neighbours, similarities)
+        ]
+        with transaction.atomic():
+            SimilarTitle.objects.filter(
+                title_id__in=matrix.title_ids[chunk].tolist()).delete()
+            SimilarTitle.objects.bulk_create(objects)
+    return len(rows)
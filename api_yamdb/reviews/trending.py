@@ -0,0 +1,70 @@
+import math
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from reviews.models import Review, Title, TitleTrend
+
+TRENDING_EPOCH = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+# Отзывы старше десяти периодов полураспада дают вклад меньше 1/1000.
+WINDOW_HALF_LIVES = 10
+CHUNK_SIZE = 1000
+
+
+def review_log_weight(pub_date, half_life):
+    return math.log(2) * ((pub_date - TRENDING_EPOCH) / half_life)
+
+
+def log_add(log_a, log_b):
+    """log(exp(log_a) + exp(log_b)) без переполнения."""
+    if log_a is None:
+        return log_b
+    high, low = max(log_a, log_b), min(log_a, log_b)
+    return high + math.log1p(math.exp(low - high))
+
+
+def get_touched_title_ids(since):
+    titles = Title.objects.all()
+    if since is not None:
+        titles = titles.filter(reviews_modified__gte=since)
+    return list(titles.values_list("id", flat=True))
+
+
+def update_trending(full=False):
+    """
+    Пересчитывает популярность произведений, отзывы которых изменились
+    с прошлого запуска (или всех при full=True).
+    Возвращает пару (пересчитано, удалено из рейтинга).
+    """
+    started = timezone.now()
+    half_life = timedelta(hours=settings.TRENDING_HALF_LIFE_HOURS)
+    since = None
+    if not full:
+        since = TitleTrend.objects.aggregate(
+            last=Max("computed_at"))["last"]
+    window_start = started - half_life * WINDOW_HALF_LIVES
+    title_ids = get_touched_title_ids(since)
+    updated = removed = 0
+    for offset in range(0, len(title_ids), CHUNK_SIZE):
+        chunk = title_ids[offset:offset + CHUNK_SIZE]
+        scores = {}
+        reviews = Review.objects.filter(
+            title_id__in=chunk, pub_date__gte=window_start,
+        ).order_by().values_list("title_id", "pub_date")
+        for title_id, pub_date in reviews.iterator():
+            scores[title_id] = log_add(
+                scores.get(title_id), review_log_weight(pub_date, half_life))
+        with transaction.atomic():
+            deleted, _ = TitleTrend.objects.filter(
+                title_id__in=chunk).delete()
+            TitleTrend.objects.bulk_create(
+                TitleTrend(title_id=title_id, score=score,
+                           computed_at=started)
+                for title_id, score in scores.items()
+            )
+        updated += len(scores)
+        removed += max(deleted - len(scores), 0)
+    return updated, removed
@@ -0,0 +1,138 @@
+import json
+import statistics
+import time
+from pathlib import Path
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from benchmarks.dataset import SCALES, seed
+
+BASELINE_PATH = Path(__file__).parent / 'baseline.json'
+WARMUP = 3
+# Результаты текущего запуска для итоговой таблицы.
+BENCHMARK_RESULTS = {}
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('benchmarks')
+    group.addoption(
+        '--bench-scale', choices=SCALES, default='10k',
+        help='Размер набора данных (количество отзывов)')
+    group.addoption(
+        '--bench-iterations', type=int, default=50,
+        help='Количество измерений на сценарий')
+    group.addoption(
+        '--bench-tolerance', type=float, default=2.0,
+        help='Допустимое ухудшение p95 и пропускной способности (во сколько '
+             'раз) относительно baseline.json')
+    group.addoption(
+        '--bench-update-baseline', action='store_true',
+        help='Записать результаты в baseline.json вместо сравнения')
+
+
+def load_baseline():
+    if not BASELINE_PATH.exists():
+        return {}
+    return json.loads(BASELINE_PATH.read_text())
+
+
+@pytest.fixture(scope='session', autouse=True)
+def benchmark_settings():
+    """
+    Ответы каталога не кешируются, чтобы измерять сами представления.
+    Остальной кеш (роли пользователей из токенов) работает как обычно.
+    """
+    from django.test import override_settings
+    with override_settings(CATALOG_CACHE_TIMEOUT=0):
+        yield
+
+
+@pytest.fixture(scope='session')
+def django_db_setup(django_db_setup, django_db_blocker, request):
+    with django_db_blocker.unblock():
+        seed(SCALES[request.config.getoption('--bench-scale')])
+
+
+class Benchmark:
+    """Замеры сценариев и сравнение с зафиксированным baseline."""
+
+    def __init__(self, config):
+        self.scale = config.getoption('--bench-scale')
+        self.iterations = config.getoption('--bench-iterations')
+        self.tolerance = config.getoption('--bench-tolerance')
+        self.update_baseline = config.getoption('--bench-update-baseline')
+        self.baseline = load_baseline().get(self.scale, {})
+        self.results = BENCHMARK_RESULTS
+
+    def measure(self, name, func):
+        """
+        Вызывает func(i) для i из range(iterations) после прогрева.
+        Возвращает p50/p95 в миллисекундах, пропускную способность
+        и наибольшее число запросов к БД за вызов.
+        """
+        for idx in range(WARMUP):
+            func(-idx - 1)
+        samples, queries = [], 0
+        for idx in range(self.iterations):
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                func(idx)
+                samples.append(time.perf_counter() - started)
+            queries = max(queries, len(captured))
+        result = {
+            'p50_ms': round(statistics.median(samples) * 1000, 3),
+            'p95_ms': round(statistics.quantiles(
+                samples, n=100, method='inclusive')[94] * 1000, 3),
+            'throughput_rps': round(len(samples) / sum(samples), 1),
+            'queries': queries,
+        }
+        self.results[name] = result
+        if not self.update_baseline:
+            self.check(name, result)
+        return result
+
+    def check(self, name, result):
+        baseline = self.baseline.get(name)
+        if baseline is None:
+            return
+        assert result['queries'] <= baseline['queries'], (
+            f'{name}: запросов к БД {result["queries"]}, '
+            f'в baseline {baseline["queries"]}'
+        )
+        assert result['p95_ms'] <= baseline['p95_ms'] * self.tolerance, (
+            f'{name}: p95 {result["p95_ms"]} мс, '
+            f'в baseline {baseline["p95_ms"]} мс'
+        )
+        assert (result['throughput_rps'] * self.tolerance
+                >= baseline['throughput_rps']), (
+            f'{name}: {result["throughput_rps"]} запросов/с, '
+            f'в baseline {baseline["throughput_rps"]}'
+        )
+
+    def save_baseline(self):
+        baseline = load_baseline()
+        baseline.setdefault(self.scale, {}).update(self.results)
+        BASELINE_PATH.write_text(
+            json.dumps(baseline, indent=2, sort_keys=True) + '\n')
+
+
+@pytest.fixture(scope='session')
+def benchmark(request):
+    bench = Benchmark(request.config)
+    yield bench
+    if bench.update_baseline and bench.results:
+        bench.save_baseline()
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    scale = config.getoption('--bench-scale')
+    terminalreporter.section(f'benchmarks ({scale})')
+    for name, result in sorted(BENCHMARK_RESULTS.items()):
+        terminalreporter.write_line(
+            f'{name:<16} p50 {result["p50_ms"]:>9.3f} мс  '
+            f'p95 {result["p95_ms"]:>9.3f} мс  '
+            f'{result["throughput_rps"]:>8.1f} запросов/с  '
+            f'{result["queries"]:>3} запросов к БД'
+        )
@@ -0,0 +1,29 @@
+import io
+
+from django.core.management import call_command
+
+from reviews.export import EXPORT_TABLES
+from reviews.generator import SyntheticDataset
+
+SCALES = {
+    '10k': 10_000,
+    '100k': 100_000,
+    '1m': 1_000_000,
+}
+SEED = 2024
+END_DATE = '2025-01-01'
+
+
+def seed(rows):
+    """
+    Заполняет БД набором из rows отзывов с неравномерной популярностью
+    произведений и активностью пользователей (см. generatedata).
+    """
+    dataset = SyntheticDataset(
+        reviews=rows, titles=max(rows // 20, 1), users=max(rows // 5, 1),
+        comments=rows // 3, categories=10, genres=30, end_date=END_DATE,
+        seed=SEED,
+    )
+    for table in EXPORT_TABLES:
+        dataset.insert(table)
+    call_command('rebuildratings', stdout=io.StringIO())
@@ -0,0 +1,160 @@
+"""
+Конкурентные чтение и запись в файловую SQLite: стандартные настройки
+Django против настроек проекта (WAL, BEGIN IMMEDIATE, busy timeout).
+
+Запуск из корня репозитория:
+    python benchmarks/sqlite_concurrency.py --writers 4 --readers 8
+
+Каждый режим выполняется в отдельном процессе с новой базой: потоки-
+писатели добавляют комментарии (чтение отзыва и запись в одной
+транзакции, как в API), потоки-читатели выбирают страницу произведений.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+MODES = ('default', 'tuned')
+TITLES = 50
+
+
+def percentile(samples, percent):
+    if len(samples) < 2:
+        return samples[0] if samples else 0
+    return statistics.quantiles(
+        samples, n=100, method='inclusive')[percent - 1]
+
+
+def setup_django(mode, path):
+    sys.path.insert(0, str(ROOT / 'api_yamdb'))
+    os.environ['DJANGO_SETTINGS_MODULE'] = 'api_yamdb.settings'
+    from django.conf import settings
+    database = settings.DATABASES['default']
+    database['NAME'] = path
+    if mode == 'default':
+        database['ENGINE'] = 'django.db.backends.sqlite3'
+        database['OPTIONS'] = {}
+    import django
+    django.setup()
+
+
+def seed():
+    import io
+
+    from django.core.management import call_command
+
+    from reviews.models import Category, Review, Title, User
+
+    call_command('migrate', verbosity=0, stdout=io.StringIO())
+    category = Category.objects.create(name='Фильм', slug='movie')
+    author = User.objects.create(username='author', email='a@yamdb.fake')
+    for idx in range(TITLES):
+        title = Title.objects.create(
+            name=f'Фильм {idx}', year=2000, category=category)
+        Review.objects.create(
+            title=title, author=author, text='Отзыв', score=5)
+    return author.id
+
+
+def run_mode(mode, path, writers, readers, duration):
+    """Нагрузка в текущем процессе. Возвращает статистику по операциям."""
+    setup_django(mode, path)
+    from django.db import OperationalError, connection, transaction
+
+    from reviews.models import Comment, Review, Title
+
+    author_id = seed()
+    review_ids = list(Review.objects.values_list('id', flat=True))
+    stats = {'read': [], 'write': [], 'errors': 0}
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def write(idx):
+        with transaction.atomic():
+            review = Review.objects.get(pk=review_ids[idx % len(review_ids)])
+            Comment.objects.create(
+                review=review, author_id=author_id, text='Комментарий')
+
+    def read(idx):
+        Title.objects.count()
+        list(Title.objects.select_related('category').order_by('name')[:10])
+
+    def worker(kind, operation):
+        idx = 0
+        samples, errors = [], 0
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            try:
+                operation(idx)
+            except OperationalError:
+                errors += 1
+            else:
+                samples.append(time.perf_counter() - started)
+            idx += 1
+        connection.close()
+        with lock:
+            stats[kind].extend(samples)
+            stats['errors'] += errors
+
+    threads = [
+        threading.Thread(target=worker, args=('write', write))
+        for _ in range(writers)
+    ] + [
+        threading.Thread(target=worker, args=('read', read))
+        for _ in range(readers)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    result = {
+        f'{kind}_{name}': value
+        for kind in ('read', 'write')
+        for name, value in (
+            ('per_s', round(len(stats[kind]) / duration, 1)),
+            ('p50_ms', round(percentile(stats[kind], 50) * 1000, 2)),
+            ('p95_ms', round(percentile(stats[kind], 95) * 1000, 2)),
+        )
+    }
+    result['errors'] = stats['errors']
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=5)
+    parser.add_argument('--mode', choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.mode:
+        with tempfile.TemporaryDirectory() as directory:
+            print(json.dumps(run_mode(
+                args.mode, Path(directory) / 'db.sqlite3', args.writers,
+                args.readers, args.duration)))
+        return
+    results = {}
+    for mode in MODES:
+        output = subprocess.run(
+            [sys.executable, __file__, '--mode', mode,
+             '--writers', str(args.writers), '--readers', str(args.readers),
+             '--duration', str(args.duration)],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        results[mode] = json.loads(output.splitlines()[-1])
+    columns = list(results[MODES[0]])
+    print(f'{"":<10}' + ''.join(f'{column:>14}' for column in columns))
+    for mode, result in results.items():
+        print(f'{mode:<10}' + ''.join(
+            f'{result[column]:>14}' for column in columns))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+from http import HTTPStatus
+
+import pytest
+from django.contrib.auth.tokens import default_token_generator
+from django.db.models import Count
+from rest_framework.test import APIClient
+
+from api.authentication import RoleAccessToken
+from reviews.models import Review, Title, User
+
+pytestmark = pytest.mark.django_db
+
+
+def get_client(user=None):
+    client = APIClient()
+    if user is not None:
+        client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {RoleAccessToken.for_user(user)}')
+    return client
+
+
+@pytest.fixture
+def title():
+    """Самое популярное произведение: худший случай для списков."""
+    return Title.objects.order_by('-rating_count', 'id').first()
+
+
+@pytest.fixture
+def review():
+    """Отзыв с наибольшим числом комментариев: непустая страница."""
+    return Review.objects.annotate(
+        comments_count=Count('comments')).order_by(
+        '-comments_count', 'id').first()
+
+
+def check_status(response, status=HTTPStatus.OK):
+    assert response.status_code == status, response.content
+
+
+def test_title_list(benchmark):
+    client = get_client()
+    benchmark.measure('title_list', lambda idx: check_status(
+        client.get('/api/v1/titles/')))
+
+
+def test_title_detail(benchmark):
+    client = get_client()
+    ids = list(Title.objects.order_by('?').values_list('id', flat=True)[:50])
+    benchmark.measure('title_detail', lambda idx: check_status(
+        client.get(f'/api/v1/titles/{ids[idx % len(ids)]}/')))
+
+
+def test_review_list(benchmark, title):
+    client = get_client()
+    benchmark.measure('review_list', lambda idx: check_status(
+        client.get(f'/api/v1/titles/{title.id}/reviews/')))
+
+
+def test_review_create(benchmark, title):
+    # Каждый отзыв от нового автора: второй отзыв на произведение
+    # запрещён. Прогрев использует авторов с конца списка.
+    User.objects.bulk_create(
+        User(username=f'bench{idx}', email=f'bench{idx}@yamdb.fake')
+        for idx in range(benchmark.iterations + 10)
+    )
+    # bulk_create на SQLite не возвращает id.
+    authors = list(User.objects.filter(username__startswith='bench'))
+    clients = [get_client(author) for author in authors]
+    # Роль автора уже в кеше, как у активного пользователя.
+    for client in clients:
+        client.get(f'/api/v1/titles/{title.id}/reviews/')
+    benchmark.measure('review_create', lambda idx: check_status(
+        clients[idx].post(
+            f'/api/v1/titles/{title.id}/reviews/',
+            data={'text': 'Отзыв', 'score': 7},
+        ),
+        HTTPStatus.CREATED,
+    ))
+
+
+def test_comment_list(benchmark, review):
+    client = get_client()
+    benchmark.measure('comment_list', lambda idx: check_status(
+        client.get(f'/api/v1/titles/{review.title_id}/reviews/'
+                   f'{review.id}/comments/')))
+
+
+def test_token_issue(benchmark):
+    client = get_client()
+    user = User.objects.order_by('id').first()
+    data = {
+        'username': user.username,
+        'confirmation_code': default_token_generator.make_token(user),
+    }
+    benchmark.measure('token_issue', lambda idx: check_status(
+        client.post('/api/v1/auth/token/', data=data)))
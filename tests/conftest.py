@@ -1,6 +1,8 @@
 import os
 import sys
 
+import pytest
+
 from django.utils.version import get_version
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -30,6 +32,30 @@ if FILENAME not in project_dir_content:
 
 assert get_version() < '4.0.0', 'Пожалуйста, используйте версию Django < 4.0.0'
 
+
+@pytest.fixture(scope='session')
+def django_db_modify_db_settings(
+        django_db_modify_db_settings_parallel_suffix):
+    """Реплика для тестов роутера: зеркало основной тестовой базы."""
+    from django.conf import settings
+    from django.db import connections
+    settings.DATABASES.setdefault('replica', {
+        **settings.DATABASES['default'],
+        'TEST': {'MIRROR': 'default'},
+    })
+    connections.configure_settings(settings.DATABASES)
+
+
+@pytest.fixture(autouse=True)
+def eager_email_outbox(settings):
+    settings.EMAIL_OUTBOX_EAGER = True
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    from django.core.cache import cache
+    cache.clear()
+
 pytest_plugins = [
     'tests.fixtures.fixture_user',
 ]
@@ -0,0 +1,86 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Category, Genre, Title
+
+
+def create_bulk_titles(count):
+    category, _ = Category.objects.get_or_create(name='Фильм', slug='films')
+    genres = [
+        Genre.objects.get_or_create(name='Ужасы', slug='horror')[0],
+        Genre.objects.get_or_create(name='Комедия', slug='comedy')[0],
+    ]
+    titles = []
+    for idx in range(count):
+        title = Title.objects.create(
+            name=f'Произведение {Title.objects.count():03}',
+            year=2000,
+            category=category
+        )
+        title.genre.set(genres)
+        titles.append(title)
+    return titles
+
+
+def count_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    return len(context.captured_queries)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08QueryBudget:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    def test_01_title_list_queries_do_not_depend_on_page_size(self, client):
+        create_bulk_titles(1)
+        one_title_queries = count_queries(client, self.TITLES_URL)
+        create_bulk_titles(20)
+        full_page_queries = count_queries(client, self.TITLES_URL)
+        assert one_title_queries == full_page_queries == 3, (
+            f'Проверьте, что GET-запрос к `{self.TITLES_URL}` выполняет '
+            'постоянное число запросов к БД независимо от размера страницы: '
+            'категории и жанры должны загружаться через '
+            '`select_related`/`prefetch_related`.'
+        )
+
+    def test_02_title_detail_queries(self, client):
+        title = create_bulk_titles(1)[0]
+        url = self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=title.id)
+        # Отметка изменения для ETag, произведение и его жанры.
+        assert count_queries(client, url) == 3, (
+            f'Проверьте, что GET-запрос к `{self.TITLES_DETAIL_URL_TEMPLATE}` '
+            'загружает категорию и жанры без дополнительных запросов.'
+        )
+
+    def test_03_title_write_queries(self, admin_client):
+        title = create_bulk_titles(1)[0]
+        data = {
+            'name': 'Новое произведение',
+            'year': 1999,
+            'genre': ['horror', 'comedy'],
+            'category': 'films',
+        }
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post(self.TITLES_URL, data=data)
+        assert response.status_code == HTTPStatus.CREATED
+        create_queries = len(context.captured_queries)
+
+        url = self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=title.id)
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.patch(url, data={'name': 'Другое'})
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['category']['slug'] == 'films'
+        assert len(response.json()['genre']) == 2
+        patch_queries = len(context.captured_queries)
+
+        assert create_queries <= 11 and patch_queries <= 6, (
+            f'Проверьте, что POST- и PATCH-запросы к `{self.TITLES_URL}` '
+            'не выполняют лишних запросов к БД при формировании ответа.'
+        )
@@ -0,0 +1,69 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09CursorPagination:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def test_01_review_cursor_pages(self, admin_client, admin, user_client,
+                                    user, moderator_client, moderator):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        reviews, titles = create_reviews(admin_client, author_map)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+
+        response = admin_client.get(url, {'pagination': 'cursor'})
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert 'count' not in data and 'next' in data, (
+            f'Проверьте, что запрос к `{self.REVIEWS_URL_TEMPLATE}` с '
+            'параметром `pagination=cursor` возвращает курсорную страницу '
+            'без ключа `count`.'
+        )
+        assert [review['id'] for review in data['results']] == sorted(
+            (review['id'] for review in reviews), reverse=True
+        ), (
+            'Проверьте, что курсорная пагинация отзывов упорядочена по '
+            'убыванию `pub_date`.'
+        )
+
+        response = admin_client.get(url)
+        assert response.json()['count'] == len(reviews), (
+            'Проверьте, что без параметра `pagination=cursor` пагинация '
+            'отзывов не изменилась.'
+        )
+
+    def test_02_title_cursor_next_page(self, admin_client):
+        admin_client.post('/api/v1/categories/', data={
+            'name': 'Фильм', 'slug': 'films'
+        })
+        for idx in range(12):
+            response = admin_client.post(self.TITLES_URL, data={
+                'name': f'Произведение {idx:02}',
+                'year': 2000,
+                'category': 'films',
+            })
+            assert response.status_code == HTTPStatus.CREATED
+
+        response = admin_client.get(self.TITLES_URL, {'pagination': 'cursor'})
+        first_page = response.json()
+        assert len(first_page['results']) == 10
+        assert first_page['next']
+
+        response = admin_client.get(first_page['next'])
+        second_page = response.json()
+        names = [title['name'] for title in (
+            first_page['results'] + second_page['results'])]
+        assert names == sorted(names) and len(names) == 12, (
+            f'Проверьте, что курсорная пагинация `{self.TITLES_URL}` '
+            'возвращает все произведения по порядку названий.'
+        )
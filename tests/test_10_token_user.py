@@ -0,0 +1,97 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from api.authentication import RoleAccessToken
+
+
+def role_token_client(user):
+    client = APIClient()
+    client.credentials(
+        HTTP_AUTHORIZATION=f'Bearer {RoleAccessToken.for_user(user)}'
+    )
+    return client
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10TokenUser:
+
+    USERS_URL = '/api/v1/users/'
+    USER_DETAIL_URL_TEMPLATE = '/api/v1/users/{username}/'
+
+    def test_01_token_claims(self, admin):
+        token = RoleAccessToken.for_user(admin)
+        assert token['role'] == admin.role, (
+            'Проверьте, что access-токен содержит роль пользователя.'
+        )
+        assert token['username'] == admin.username, (
+            'Проверьте, что access-токен содержит имя пользователя.'
+        )
+
+    def test_02_permissions_without_user_lookup(self, admin):
+        client = role_token_client(admin)
+        client.get(self.USERS_URL)
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(self.USERS_URL)
+        assert response.status_code == HTTPStatus.OK
+        user_lookups = [
+            query['sql'] for query in context.captured_queries
+            if 'WHERE "reviews_user"."id"' in query['sql']
+        ]
+        assert not user_lookups, (
+            'Проверьте, что для токена с ролью в claims проверка прав '
+            'не загружает пользователя из БД при каждом запросе.'
+        )
+
+    def test_03_role_change_invalidates_token(self, admin, user,
+                                              user_superuser_client):
+        user_client = role_token_client(user)
+        response = user_client.get(self.USERS_URL)
+        assert response.status_code == HTTPStatus.FORBIDDEN
+
+        response = user_superuser_client.patch(
+            self.USER_DETAIL_URL_TEMPLATE.format(username=user.username),
+            data={'role': 'admin'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        response = user_client.get(self.USERS_URL)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после изменения роли через `/api/v1/users/` '
+            'ранее выданный токен учитывает новую роль.'
+        )
+
+        response = user_superuser_client.delete(
+            self.USER_DETAIL_URL_TEMPLATE.format(username=user.username)
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        response = user_client.get(self.USERS_URL)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что токен удалённого пользователя перестаёт '
+            'действовать.'
+        )
+
+    def test_04_me_with_role_token(self, user):
+        client = role_token_client(user)
+        response = client.get(f'{self.USERS_URL}me/')
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['email'] == user.email
+
+    def test_05_changes_outside_api_expire(self, admin, settings):
+        settings.TOKEN_USER_CACHE_TIMEOUT = 0
+        client = role_token_client(admin)
+        assert client.get(self.USERS_URL).status_code == HTTPStatus.OK
+
+        type(admin).objects.filter(pk=admin.pk).update(role='user')
+        response = client.get(self.USERS_URL)
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что роль из токена перечитывается из БД после '
+            'TOKEN_USER_CACHE_TIMEOUT, даже если изменение сделал '
+            'другой процесс.'
+        )
+
+        type(admin).objects.filter(pk=admin.pk).delete()
+        response = client.get(self.USERS_URL)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
@@ -0,0 +1,58 @@
+from http import HTTPStatus
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.utils import timezone
+
+from reviews.models import OutgoingEmail
+from reviews.outbox import queue_depth
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11EmailOutbox:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+    VALID_DATA = {
+        'email': 'valid@yamdb.fake',
+        'username': 'valid_username'
+    }
+
+    def test_01_signup_enqueues_email(self, client, settings):
+        settings.EMAIL_OUTBOX_EAGER = False
+        outbox_before_count = len(mail.outbox)
+        response = client.post(self.URL_SIGNUP, data=self.VALID_DATA)
+        assert response.status_code == HTTPStatus.OK
+        assert len(mail.outbox) == outbox_before_count, (
+            f'Проверьте, что POST-запрос к `{self.URL_SIGNUP}` не отправляет '
+            'письмо синхронно, а ставит его в очередь.'
+        )
+        assert queue_depth() == 1
+
+        call_command('sendoutbox')
+        assert len(mail.outbox) == outbox_before_count + 1, (
+            'Проверьте, что команда `sendoutbox` отправляет письма из '
+            'очереди.'
+        )
+        assert self.VALID_DATA['email'] in mail.outbox[-1].to
+        assert queue_depth() == 0
+
+    def test_02_failed_email_is_retried_later(self, client, settings,
+                                              monkeypatch):
+        settings.EMAIL_OUTBOX_EAGER = False
+        client.post(self.URL_SIGNUP, data=self.VALID_DATA)
+
+        def fail(self, messages):
+            raise ConnectionError('SMTP недоступен')
+
+        monkeypatch.setattr(EmailBackend, 'send_messages', fail)
+        call_command('sendoutbox')
+        email = OutgoingEmail.objects.get()
+        assert email.sent_at is None and email.attempts == 1, (
+            'Проверьте, что неудачная отправка увеличивает счётчик попыток.'
+        )
+        assert email.next_attempt_at > timezone.now(), (
+            'Проверьте, что повторная отправка откладывается.'
+        )
+        assert queue_depth() == 1
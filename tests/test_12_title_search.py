@@ -0,0 +1,73 @@
+import io
+import time
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Title
+
+MANY_MATCHES = 6000
+SEARCH_BUDGET = 1.0
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12TitleSearch:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_search_ranked_by_relevance(self, client):
+        Title.objects.create(
+            name='Крепкий орешек', year=1988,
+            description='Полицейский против террористов')
+        Title.objects.create(
+            name='Терминатор', year=1984,
+            description='Киборг и полицейский участок')
+        Title.objects.create(
+            name='Полицейская академия', year=1984, description='Комедия')
+
+        response = client.get(self.TITLES_URL, {'search': 'полицейск'})
+        assert response.status_code == HTTPStatus.OK
+        names = [title['name'] for title in response.json()['results']]
+        assert names[0] == 'Полицейская академия', (
+            f'Проверьте, что поиск `{self.TITLES_URL}?search=` ставит '
+            'совпадения в названии выше совпадений в описании.'
+        )
+        assert set(names) == {
+            'Крепкий орешек', 'Терминатор', 'Полицейская академия'
+        }
+
+    def test_02_index_follows_title_changes(self, client):
+        title = Title.objects.create(name='Побег', year=1994)
+        title.name = 'Зелёная миля'
+        title.save()
+
+        response = client.get(self.TITLES_URL, {'search': 'побег'})
+        assert response.json()['count'] == 0, (
+            'Проверьте, что поисковый индекс обновляется при изменении '
+            'произведения.'
+        )
+        response = client.get(self.TITLES_URL, {'search': 'миля'})
+        assert response.json()['count'] == 1
+
+        title.delete()
+        response = client.get(self.TITLES_URL, {'search': 'миля'})
+        assert response.json()['count'] == 0, (
+            'Проверьте, что удалённое произведение исчезает из поиска.'
+        )
+
+    def test_03_many_matches_within_budget(self, client):
+        Title.objects.bulk_create(
+            Title(name=f'Произведение {number}', year=2000)
+            for number in range(MANY_MATCHES))
+        call_command('rebuildsearch', stdout=io.StringIO())
+
+        started = time.monotonic()
+        response = client.get(self.TITLES_URL, {'search': 'произведение'})
+        elapsed = time.monotonic() - started
+        assert response.json()['count'] == MANY_MATCHES
+        assert elapsed < SEARCH_BUDGET, (
+            'Проверьте, что поиск читает таблицу FTS один раз, а не '
+            f'для каждого совпадения: {elapsed:.1f} с на '
+            f'{MANY_MATCHES} совпадений.'
+        )
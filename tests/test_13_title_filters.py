@@ -0,0 +1,66 @@
+import re
+
+import pytest
+
+from api.filters import TitleFilter
+from api.serializers import TITLE_SERVICE_FIELDS
+from reviews.models import Category, Genre, Title
+
+
+def create_filter_titles():
+    category = Category.objects.create(name='Фильм', slug='films')
+    genre = Genre.objects.create(name='Драма', slug='drama')
+    for year in (1972, 1988, 1994, 2001):
+        title = Title.objects.create(
+            name=f'Фильм {year}', year=year, category=category)
+        title.genre.set([genre])
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13TitleFilters:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    @pytest.mark.parametrize('params,expected_years', [
+        ({'year': 1994}, {1994}),
+        ({'year_min': 1980, 'year_max': 1995}, {1988, 1994}),
+        ({'year__in': '1972,2001'}, {1972, 2001}),
+        ({'category_slug': 'films'}, {1972, 1988, 1994, 2001}),
+        ({'category_slug': 'film'}, set()),
+        ({'category': 'film'}, {1972, 1988, 1994, 2001}),
+        ({'genre_slug': 'drama'}, {1972, 1988, 1994, 2001}),
+    ])
+    def test_01_filters(self, client, params, expected_years):
+        create_filter_titles()
+        response = client.get(self.TITLES_URL, params)
+        years = {title['year'] for title in response.json()['results']}
+        assert years == expected_years, (
+            f'Проверьте фильтрацию `{self.TITLES_URL}` по параметрам '
+            f'{params}.'
+        )
+
+    @pytest.mark.parametrize('params', [
+        {'year': '1994'},
+        {'year_min': '1980', 'year_max': '1995'},
+        {'year__in': '1972,2001'},
+        {'category_slug': 'films'},
+        {'genre_slug': 'drama'},
+    ])
+    def test_02_filters_use_index(self, params):
+        create_filter_titles()
+        queryset = TitleFilter(params, queryset=Title.objects.all()).qs
+        plan = queryset.explain()
+        assert not re.search(r'\bSCAN reviews_title\b', plan), (
+            f'Фильтр {params} не должен приводить к полному просмотру '
+            f'таблицы произведений:\n{plan}'
+        )
+        assert 'USING INDEX' in plan or 'PRIMARY KEY' in plan, plan
+
+    def test_03_service_fields_not_filterable(self, client):
+        create_filter_titles()
+        assert not set(TitleFilter.base_filters) & set(TITLE_SERVICE_FIELDS)
+        response = client.get(self.TITLES_URL, {'rating_count': 5})
+        assert response.json()['count'] == 4, (
+            'Проверьте, что по служебным полям произведения '
+            'нельзя фильтровать.'
+        )
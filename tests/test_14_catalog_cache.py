@@ -0,0 +1,104 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection, transaction
+from django.db.models.signals import post_delete
+from django.test.utils import CaptureQueriesContext
+
+from api.cache import get_catalog_version
+from reviews.models import (
+    Category, ImportCheckpoint, OutgoingEmail, SimilarTitle, Title,
+    TitleTrend,
+)
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14CatalogCache:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    CATEGORIES_URL = '/api/v1/categories/'
+
+    def test_01_repeated_get_served_from_cache(self, client, admin_client):
+        create_titles(admin_client)
+        for url in (self.TITLES_URL, self.CATEGORIES_URL):
+            first = client.get(url)
+            with CaptureQueriesContext(connection) as context:
+                second = client.get(url)
+            assert second.status_code == HTTPStatus.OK
+            assert second.json() == first.json()
+            assert not context.captured_queries, (
+                f'Проверьте, что повторный GET-запрос к `{url}` '
+                'отдаётся из кеша без запросов к БД.'
+            )
+
+    def test_02_query_string_is_part_of_key(self, client, admin_client):
+        create_titles(admin_client)
+        response = client.get(self.TITLES_URL, {'year': 1984})
+        assert response.json()['count'] == 1
+        response = client.get(self.TITLES_URL, {'year': 1988})
+        assert response.json()['count'] == 1
+        assert response.json()['results'][0]['year'] == 1988
+
+    def test_03_writes_invalidate_cache(self, client, admin_client,
+                                        user_client):
+        titles, _, _ = create_titles(admin_client)
+        url = self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        assert client.get(url).json()['rating'] is None
+
+        create_single_review(user_client, titles[0]['id'], 'Отлично', 8)
+        assert client.get(url).json()['rating'] == 8, (
+            'Проверьте, что создание отзыва сбрасывает кеш произведений.'
+        )
+
+        admin_client.patch(url, data={'genre': ['drama']})
+        genres = client.get(url).json()['genre']
+        assert [genre['slug'] for genre in genres] == ['drama'], (
+            'Проверьте, что изменение жанров произведения сбрасывает кеш.'
+        )
+
+        admin_client.post(
+            self.CATEGORIES_URL, data={'name': 'Музыка', 'slug': 'music'})
+        slugs = [
+            category['slug']
+            for category in client.get(self.CATEGORIES_URL).json()['results']
+        ]
+        assert 'music' in slugs, (
+            'Проверьте, что создание категории сбрасывает кеш категорий.'
+        )
+
+    def test_04_invalidation_waits_for_commit(self):
+        version = get_catalog_version()
+        with transaction.atomic():
+            Category.objects.create(name='Музыка', slug='music')
+            assert get_catalog_version() == version, (
+                'Проверьте, что кеш каталога сбрасывается после коммита, '
+                'а не внутри транзакции записи.'
+            )
+        assert get_catalog_version() != version
+
+    def test_05_other_models_keep_fast_delete(self, admin_client):
+        for Model in (OutgoingEmail, SimilarTitle, TitleTrend,
+                      ImportCheckpoint):
+            assert not post_delete.has_listeners(Model), (
+                'Проверьте, что сброс кеша каталога подключён только '
+                f'к моделям каталога, а не к {Model.__name__}.'
+            )
+        titles, _, _ = create_titles(admin_client)
+        title_ids = [title['id'] for title in titles]
+        SimilarTitle.objects.bulk_create(
+            SimilarTitle(title_id=title_id, similar_id=similar_id, score=1,
+                         computed_at=Title.objects.get(pk=title_id).modified)
+            for title_id in title_ids for similar_id in title_ids
+            if similar_id != title_id
+        )
+        with CaptureQueriesContext(connection) as context:
+            SimilarTitle.objects.filter(title_id__in=title_ids).delete()
+        statements = [query['sql'].split()[0]
+                      for query in context.captured_queries]
+        assert statements.count('SELECT') == 0, (
+            'Проверьте, что похожие произведения удаляются одним DELETE '
+            'без загрузки объектов.'
+        )
+        assert statements.count('DELETE') == 1
@@ -0,0 +1,127 @@
+from http import HTTPStatus
+
+import io
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Review, Title
+from tests.utils import (
+    create_comments, create_single_comment, create_single_review,
+    create_titles,
+)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15ConditionalGet:
+
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def test_01_not_modified(self, client, admin_client, admin, user_client,
+                             user):
+        author_map = {admin: admin_client, user: user_client}
+        _, reviews, titles = create_comments(admin_client, author_map)
+        urls = (
+            self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id']),
+            self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id']),
+            self.COMMENTS_URL_TEMPLATE.format(
+                title_id=titles[0]['id'], review_id=reviews[0]['id']),
+        )
+        for url in urls:
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            etag = response['ETag']
+            last_modified = response['Last-Modified']
+            assert etag and last_modified, (
+                f'Проверьте, что ответ на GET-запрос к `{url}` содержит '
+                'заголовки `ETag` и `Last-Modified`.'
+            )
+
+            with CaptureQueriesContext(connection) as context:
+                response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+                f'Проверьте, что GET-запрос к `{url}` с совпадающим '
+                '`If-None-Match` возвращает ответ со статусом 304.'
+            )
+            assert len(context.captured_queries) == 1, (
+                'Проверьте, что ответ 304 формируется одним запросом к БД.'
+            )
+
+            response = client.get(
+                url, HTTP_IF_MODIFIED_SINCE=last_modified)
+            assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+    def test_02_changes_update_etag(self, client, admin_client, admin,
+                                    user_client, user):
+        author_map = {admin: admin_client, user: user_client}
+        _, reviews, titles = create_comments(admin_client, author_map)
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'])
+        comments_url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id'])
+
+        etag = client.get(reviews_url)['ETag']
+        user_review = next(
+            review for review in reviews if review['author'] == user.username)
+        user_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=titles[0]['id'], review_id=user_review['id']),
+            data={'text': 'Новый текст'}
+        )
+        response = client.get(reviews_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что изменение отзыва меняет `ETag` списка отзывов.'
+        )
+
+        etag = client.get(comments_url)['ETag']
+        create_single_comment(
+            user_client, titles[0]['id'], reviews[0]['id'], 'Ещё один')
+        response = client.get(comments_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что новый комментарий меняет `ETag` списка '
+            'комментариев.'
+        )
+
+    def test_03_invalid_title_id(self, client):
+        response = client.get('/api/v1/titles/abc/')
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что запрос произведения с нечисловым id '
+            'возвращает 404.'
+        )
+
+    def test_04_rebuildratings_updates_etag(self, client, admin_client,
+                                            user_client):
+        titles, _, _ = create_titles(admin_client)
+        changed, unchanged = titles[0]['id'], titles[1]['id']
+        create_single_review(user_client, changed, 'Отлично', 8)
+        create_single_review(user_client, unchanged, 'Хорошо', 6)
+        urls = (
+            self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=changed),
+            self.REVIEWS_URL_TEMPLATE.format(title_id=changed),
+        )
+        etags = {url: client.get(url)['ETag'] for url in urls}
+        untouched = Title.objects.get(pk=unchanged).modified
+
+        Review.objects.filter(title_id=changed).update(score=3)
+        call_command('rebuildratings', stdout=io.StringIO())
+
+        for url, etag in etags.items():
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == HTTPStatus.OK, (
+                'Проверьте, что rebuildratings отмечает изменение '
+                f'произведений с новыми счётчиками: `{url}`.'
+            )
+        assert client.get(urls[0]).json()['rating'] == 3
+        assert Title.objects.get(pk=unchanged).modified == untouched, (
+            'Проверьте, что rebuildratings не трогает произведения '
+            'с прежними счётчиками.'
+        )
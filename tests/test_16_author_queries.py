@@ -0,0 +1,109 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import IntegrityError, connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from api.authentication import RoleAccessToken
+from reviews.models import Comment, Review, Title, User
+
+
+def create_authors(count):
+    User.objects.bulk_create(
+        User(username=f'author{idx}', email=f'author{idx}@yamdb.fake')
+        for idx in range(count)
+    )
+    return list(User.objects.values_list('id', flat=True))
+
+
+def create_title_with_reviews(count):
+    title = Title.objects.create(name='Популярное', year=2000)
+    author_ids = create_authors(count)
+    Review.objects.bulk_create(
+        Review(title=title, author_id=author_id, text='Отзыв', score=5)
+        for author_id in author_ids
+    )
+    review = Review.objects.filter(title=title).first()
+    Comment.objects.bulk_create(
+        Comment(review=review, author_id=author_id, text='Комментарий')
+        for author_id in author_ids
+    )
+    return title, review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16AuthorQueries:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def test_01_author_loaded_in_same_query(self, client):
+        title, review = create_title_with_reviews(1000)
+        urls = (
+            self.REVIEWS_URL_TEMPLATE.format(title_id=title.id),
+            self.COMMENTS_URL_TEMPLATE.format(
+                title_id=title.id, review_id=review.id),
+        )
+        for url in urls:
+            query_counts = set()
+            for limit in (10, 100, 1000):
+                with CaptureQueriesContext(connection) as context:
+                    response = client.get(url, {'limit': limit})
+                assert response.status_code == HTTPStatus.OK
+                results = response.json()['results']
+                assert len(results) == limit
+                assert all(item['author'] for item in results)
+                query_counts.add(len(context.captured_queries))
+            assert len(query_counts) == 1 and max(query_counts) <= 3, (
+                f'Проверьте, что GET-запрос к `{url}` загружает авторов '
+                'тем же запросом: число запросов к БД не должно зависеть '
+                f'от размера страницы ({sorted(query_counts)}).'
+            )
+
+    def test_02_review_write_path(self, user):
+        title = Title.objects.create(name='Новинка', year=2020)
+        client = APIClient()
+        client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {RoleAccessToken.for_user(user)}'
+        )
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+        # Роль и статус пользователя загружаются в кеш первым запросом.
+        client.get(url)
+        with CaptureQueriesContext(connection) as context:
+            response = client.post(url, data={'text': 'Хорошо', 'score': 7})
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json()['author'] == user.username
+        statements = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'] != 'COMMIT'
+            and not query['sql'].startswith(('BEGIN', 'SAVEPOINT', 'RELEASE'))
+        ]
+        assert len(statements) == 3, (
+            'Проверьте, что создание отзыва выполняет только выборку '
+            'произведения, вставку отзыва и обновление рейтинга:\n'
+            + '\n'.join(statements)
+        )
+
+        response = client.post(url, data={'text': 'Ещё раз', 'score': 1})
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что повторный отзыв на произведение отклоняется.'
+        )
+        title.refresh_from_db()
+        assert (title.rating_sum, title.rating_count) == (7, 1)
+
+    def test_03_other_integrity_errors_not_masked(self, user):
+        title = Title.objects.create(name='Новинка', year=2020)
+        client = APIClient()
+        client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {RoleAccessToken.for_user(user)}'
+        )
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+        # Роль и статус в кеше, затем автор удаляется в обход API.
+        client.get(url)
+        User.objects.filter(pk=user.pk).delete()
+        with pytest.raises(IntegrityError):
+            client.post(url, data={'text': 'Хорошо', 'score': 7})
+        assert not Review.objects.exists()
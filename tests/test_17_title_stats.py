@@ -0,0 +1,85 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17TitleStats:
+
+    TITLES_URL = '/api/v1/titles/'
+    STATS_URL_TEMPLATE = '/api/v1/titles/{title_id}/stats/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def test_01_stats(self, client, admin_client, user_client,
+                      moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        url = self.STATS_URL_TEMPLATE.format(title_id=title_id)
+
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Эндпоинт `{self.STATS_URL_TEMPLATE}` не найден или '
+            'недоступен неавторизованному пользователю.'
+        )
+        assert response.json()['count'] == 0
+        assert response.json()['average'] is None
+
+        create_single_review(admin_client, title_id, 'Отлично', 10)
+        create_single_review(moderator_client, title_id, 'Средне', 5)
+        review = create_single_review(user_client, title_id, 'Плохо', 2)
+        user_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=review.json()['id']),
+            data={'score': 3}
+        )
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        data = response.json()
+        assert not any(
+            'reviews_review' in query['sql']
+            for query in context.captured_queries
+        ), (
+            f'Проверьте, что `{self.STATS_URL_TEMPLATE}` не обращается к '
+            'таблице отзывов.'
+        )
+        assert data['count'] == 3
+        assert data['average'] == pytest.approx(6.0)
+        assert data['rating'] == 6
+        expected = {str(score): 0 for score in range(1, 11)}
+        expected.update({'10': 1, '5': 1, '3': 1})
+        assert data['histogram'] == expected, (
+            'Проверьте, что гистограмма оценок обновляется при создании '
+            'и изменении отзывов.'
+        )
+
+    def test_02_stats_in_title_list(self, client, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(user_client, titles[0]['id'], 'Отлично', 9)
+
+        response = client.get(self.TITLES_URL)
+        assert 'stats' not in response.json()['results'][0]
+
+        response = client.get(self.TITLES_URL, {'fields': 'stats'})
+        stats = {
+            title['id']: title['stats']
+            for title in response.json()['results']
+        }
+        assert stats[titles[0]['id']]['histogram']['9'] == 1, (
+            f'Проверьте, что `{self.TITLES_URL}?fields=stats` добавляет '
+            'статистику оценок к каждому произведению.'
+        )
+        assert stats[titles[1]['id']]['count'] == 0
+
+    def test_03_invalid_title_id(self, client):
+        response = client.get(self.STATS_URL_TEMPLATE.format(title_id='abc'))
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что статистика произведения с нечисловым id '
+            'возвращает 404.'
+        )
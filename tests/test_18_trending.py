@@ -0,0 +1,62 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.utils import timezone
+
+from reviews.models import Review, Title, User
+from reviews.trending import update_trending
+
+
+def create_review(title, username, days_ago):
+    author = User.objects.create(
+        username=username, email=f'{username}@yamdb.fake')
+    review = Review.objects.create(
+        title=title, author=author, text='Отзыв', score=5)
+    Review.objects.filter(pk=review.pk).update(
+        pub_date=timezone.now() - timedelta(days=days_ago))
+    Title.objects.filter(pk=title.pk).update(reviews_modified=timezone.now())
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18Trending:
+
+    TRENDING_URL = '/api/v1/titles/trending/'
+
+    def test_01_recent_activity_ranks_higher(self, client):
+        old = Title.objects.create(name='Классика', year=1950)
+        fresh = Title.objects.create(name='Новинка', year=2024)
+        Title.objects.create(name='Без отзывов', year=2000)
+        for idx in range(3):
+            create_review(old, f'old{idx}', days_ago=10)
+        create_review(fresh, 'fresh0', days_ago=0)
+
+        assert update_trending() == (2, 0)
+        response = client.get(self.TRENDING_URL)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Эндпоинт `{self.TRENDING_URL}` не найден или недоступен.'
+        )
+        names = [title['name'] for title in response.json()['results']]
+        assert names == ['Новинка', 'Классика'], (
+            f'Проверьте, что `{self.TRENDING_URL}` упорядочивает '
+            'произведения по затухающей со временем активности отзывов.'
+        )
+
+    def test_02_incremental_update(self, client):
+        old = Title.objects.create(name='Классика', year=1950)
+        fresh = Title.objects.create(name='Новинка', year=2024)
+        create_review(old, 'old0', days_ago=5)
+        create_review(fresh, 'fresh0', days_ago=1)
+        update_trending()
+
+        for idx in range(3):
+            create_review(old, f'old{idx + 1}', days_ago=0)
+        assert update_trending() == (1, 0), (
+            'Проверьте, что пересчитываются только произведения с '
+            'изменившимися отзывами.'
+        )
+        names = [
+            title['name']
+            for title in client.get(self.TRENDING_URL).json()['results']
+        ]
+        assert names == ['Классика', 'Новинка']
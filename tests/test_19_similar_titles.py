@@ -0,0 +1,87 @@
+from http import HTTPStatus
+
+import numpy as np
+import pytest
+
+from reviews import similarity
+from reviews.models import Review, Title, User
+from reviews.similarity import RatingMatrix, update_similar
+
+
+def dense_similarity(authors, titles, scores):
+    user_ids, user_index = np.unique(authors, return_inverse=True)
+    title_ids, title_index = np.unique(titles, return_inverse=True)
+    matrix = np.zeros((len(user_ids), len(title_ids)))
+    mask = np.zeros_like(matrix, dtype=bool)
+    matrix[user_index, title_index] = scores
+    mask[user_index, title_index] = True
+    means = matrix.sum(axis=1) / mask.sum(axis=1)
+    centered = np.where(mask, matrix - means[:, None], 0)
+    norms = np.linalg.norm(centered, axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result = centered.T @ centered / np.outer(norms, norms)
+    return np.nan_to_num(result, nan=0, posinf=0, neginf=0)
+
+
+@pytest.mark.parametrize('max_products', [7, 5_000_000])
+def test_01_matches_dense_adjusted_cosine(monkeypatch, max_products):
+    monkeypatch.setattr(similarity, 'MAX_PRODUCTS', max_products)
+    rng = np.random.default_rng(0)
+    pairs = {(int(user), int(title))
+             for user, title in rng.integers(0, [40, 15], size=(300, 2))}
+    authors, titles = map(np.array, zip(*sorted(pairs)))
+    scores = rng.integers(1, 11, size=len(authors))
+
+    matrix = RatingMatrix(authors, titles, scores)
+    rows = np.arange(matrix.n_titles)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        block = matrix.dot_block(rows) / np.outer(matrix.norms, matrix.norms)
+    block = np.nan_to_num(block, nan=0, posinf=0, neginf=0)
+    np.testing.assert_allclose(
+        block, dense_similarity(authors, titles, scores), atol=1e-9)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19SimilarTitles:
+
+    SIMILAR_URL_TEMPLATE = '/api/v1/titles/{title_id}/similar/'
+
+    def test_02_similar_endpoint(self, client):
+        titles = [
+            Title.objects.create(name=name, year=2000)
+            for name in ('Фильм A', 'Фильм B', 'Фильм C')
+        ]
+        ratings = (
+            (10, 9, 1), (9, 10, 2), (2, 1, 9), (1, 2, 10),
+        )
+        for idx, scores in enumerate(ratings):
+            author = User.objects.create(
+                username=f'critic{idx}', email=f'critic{idx}@yamdb.fake')
+            for title, score in zip(titles, scores):
+                Review.objects.create(
+                    title=title, author=author, text='Отзыв', score=score)
+
+        assert update_similar() == 3
+        response = client.get(
+            self.SIMILAR_URL_TEMPLATE.format(title_id=titles[0].id))
+        assert response.status_code == HTTPStatus.OK, (
+            f'Эндпоинт `{self.SIMILAR_URL_TEMPLATE}` не найден или '
+            'недоступен.'
+        )
+        names = [title['name'] for title in response.json()['results']]
+        assert names == ['Фильм B'], (
+            'Проверьте, что похожими считаются произведения с '
+            'похожими оценками пользователей.'
+        )
+        assert update_similar() == 0, (
+            'Проверьте, что повторный запуск без новых отзывов ничего '
+            'не пересчитывает.'
+        )
+
+        response = client.get(self.SIMILAR_URL_TEMPLATE.format(title_id=0))
+        assert response.status_code == HTTPStatus.NOT_FOUND
+        response = client.get(
+            self.SIMILAR_URL_TEMPLATE.format(title_id='abc'))
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что похожие для нечислового id возвращают 404.'
+        )
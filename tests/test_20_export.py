@@ -0,0 +1,77 @@
+import csv
+import io
+import json
+from http import HTTPStatus
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+
+from reviews.export import EXPORT_TABLES
+
+DATA_DIR = settings.BASE_DIR / 'static' / 'data'
+
+
+def read_rows(file):
+    # pub_date проставляется при создании (auto_now_add), loadcsv его
+    # не переносит, поэтому в сравнении не участвует.
+    rows = [
+        {column: value for column, value in row.items()
+         if column != 'pub_date'}
+        for row in csv.DictReader(file)
+    ]
+    return sorted(rows, key=lambda row: int(row['id']))
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20Export:
+
+    EXPORT_URL_TEMPLATE = '/api/v1/export/{table}.{export_format}'
+
+    def test_01_export_matches_loadcsv_files(self, tmp_path):
+        call_command('loadcsv', stdout=io.StringIO())
+        call_command('exportcsv', output_dir=tmp_path, chunk_size=7,
+                     stdout=io.StringIO())
+        for table in EXPORT_TABLES:
+            with open(DATA_DIR / f'{table}.csv', newline='') as file:
+                expected = read_rows(file)
+            with open(tmp_path / f'{table}.csv', newline='') as file:
+                exported = read_rows(file)
+            assert exported == expected, (
+                f'Проверьте, что выгрузка `{table}.csv` совпадает с файлом, '
+                'из которого данные загружены командой `loadcsv`.'
+            )
+
+    def test_02_export_endpoint(self, admin_client, user_client, admin):
+        url = self.EXPORT_URL_TEMPLATE.format(
+            table='users', export_format='ndjson')
+        response = user_client.get(url)
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            f'Проверьте, что `{url}` доступен только администратору.'
+        )
+
+        response = admin_client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Эндпоинт `{url}` не найден или недоступен.'
+        )
+        assert response.streaming, (
+            'Проверьте, что выгрузка отдаётся потоковым ответом.'
+        )
+        rows = [
+            json.loads(line)
+            for line in b''.join(response.streaming_content).splitlines()
+        ]
+        assert {row['username'] for row in rows} == {
+            'TestAdmin', 'TestUser'}
+        assert set(rows[0]) == set(EXPORT_TABLES['users'][1])
+
+        url = self.EXPORT_URL_TEMPLATE.format(
+            table='category', export_format='csv')
+        response = admin_client.get(url)
+        assert response['Content-Type'].startswith('text/csv')
+        content = b''.join(response.streaming_content).decode()
+        assert content.splitlines() == ['id,name,slug']
+
+        url = self.EXPORT_URL_TEMPLATE.format(
+            table='outgoingemail', export_format='csv')
+        assert admin_client.get(url).status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,156 @@
+import csv
+import io
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import QuerySet
+
+from reviews.management.commands.loadcsv import Command, pop_ready
+from reviews.models import Comment, GenreTitle, ImportCheckpoint, Review, Title
+
+
+class Test21LoadCSV:
+
+    def test_01_dependencies_from_foreign_keys(self):
+        assert Command().get_dependencies() == {
+            'category.csv': set(),
+            'genre.csv': set(),
+            'users.csv': set(),
+            'titles.csv': {'category.csv'},
+            'genre_title.csv': {'titles.csv', 'genre.csv'},
+            'review.csv': {'titles.csv', 'users.csv'},
+            'comments.csv': {'review.csv', 'users.csv'},
+        }, (
+            'Проверьте, что зависимости файлов строятся по внешним ключам.'
+        )
+
+    def test_02_independent_files_are_ready_together(self):
+        pending = Command().get_dependencies()
+        assert set(pop_ready(pending, set())) == {
+            'category.csv', 'genre.csv', 'users.csv'}
+        assert pop_ready(pending, {'category.csv'}) == ['titles.csv']
+        assert pop_ready(pending, {'category.csv'}) == []
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_workers_fall_back_for_in_memory_db(self):
+        stderr = io.StringIO()
+        call_command('loadcsv', workers=4, stdout=io.StringIO(),
+                     stderr=stderr)
+        assert 'последовательно' in stderr.getvalue()
+        assert (Title.objects.count(), GenreTitle.objects.count(),
+                Review.objects.count(), Comment.objects.count()) == (
+            32, 42, 72, 3)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21ResumeLoadCSV:
+
+    def test_01_resume_after_failed_batch(self, monkeypatch):
+        save_batch = Command.save_batch
+        calls = {'review.csv': 0}
+
+        def failing_save_batch(self, Model, objects, update_fields,
+                               checkpoint):
+            if checkpoint.file_name in calls:
+                calls[checkpoint.file_name] += 1
+                if calls[checkpoint.file_name] == 3:
+                    raise RuntimeError('Обрыв соединения')
+            return save_batch(self, Model, objects, update_fields,
+                              checkpoint)
+
+        monkeypatch.setattr(Command, 'save_batch', failing_save_batch)
+        with pytest.raises(CommandError):
+            call_command('loadcsv', batch_size=10, stdout=io.StringIO())
+        assert Review.objects.count() == 20
+        checkpoint = ImportCheckpoint.objects.get(file_name='review.csv')
+        assert (checkpoint.rows, checkpoint.completed) == (20, False), (
+            'Проверьте, что позиция сохраняется после каждой порции.'
+        )
+
+        monkeypatch.setattr(Command, 'save_batch', save_batch)
+        stdout = io.StringIO()
+        call_command('loadcsv', batch_size=10, resume=True, stdout=stdout)
+        assert 'Файл titles.csv уже загружен' in stdout.getvalue()
+        assert 'продолжение после 20 строк' in stdout.getvalue()
+        assert Review.objects.count() == 72
+        with open(Command().get_csv_file('review.csv'), newline='') as file:
+            expected = {
+                int(row['id']): (row['text'], int(row['score']))
+                for row in csv.DictReader(file)
+            }
+        assert {
+            review.id: (review.text, review.score)
+            for review in Review.objects.all()
+        } == expected, (
+            'Проверьте, что после продолжения загружены все строки файла '
+            'без пропусков и повторов.'
+        )
+
+    def test_02_reload_updates_existing_rows(self):
+        call_command('loadcsv', stdout=io.StringIO())
+        Title.objects.filter(pk=1).update(name='Изменено')
+        call_command('loadcsv', stdout=io.StringIO())
+        assert Title.objects.count() == 32, (
+            'Проверьте, что повторная загрузка не дублирует строки.'
+        )
+        assert Title.objects.get(pk=1).name == 'Побег из Шоушенка'
+
+    def test_03_rerun_keeps_rows_unchanged(self):
+        call_command('loadcsv', stdout=io.StringIO())
+        # Отметки изменения повторная загрузка обновляет (test_04).
+        fields = {
+            Model: [field.attname for field in Model._meta.concrete_fields
+                    if not field.name.endswith('modified')]
+            for Model in (Review, Comment)
+        }
+        rows = {
+            Model: list(Model.objects.order_by('pk').values(*fields[Model]))
+            for Model in (Review, Comment)
+        }
+        assert str(Review.objects.get(pk=1).pub_date.date()) == (
+            '2019-09-24'), (
+            'Проверьте, что дата публикации берётся из файла, '
+            'а не заполняется текущим временем.'
+        )
+        call_command('loadcsv', stdout=io.StringIO())
+        for Model, values in rows.items():
+            assert list(Model.objects.order_by('pk').values(
+                *fields[Model])) == values, (
+                'Проверьте, что повторная загрузка не меняет строки.'
+            )
+
+    def test_04_reload_touches_change_stamps(self):
+        call_command('loadcsv', stdout=io.StringIO())
+        title = Title.objects.get(pk=1)
+        review = Review.objects.get(pk=6)
+        call_command('loadcsv', stdout=io.StringIO())
+        reloaded_title = Title.objects.get(pk=1)
+        assert reloaded_title.modified > title.modified
+        assert reloaded_title.reviews_modified > title.reviews_modified, (
+            'Проверьте, что загрузка отзывов отмечает изменение отзывов '
+            'их произведений.'
+        )
+        assert Review.objects.get(pk=6).comments_modified > (
+            review.comments_modified), (
+            'Проверьте, что загрузка комментариев отмечает изменение '
+            'комментариев их отзывов.'
+        )
+
+    def test_05_field_metadata_untouched(self, monkeypatch):
+        bulk_create = QuerySet.bulk_create
+        flags = []
+
+        def recording_bulk_create(queryset, objs, *args, **kwargs):
+            if queryset.model is Review:
+                flags.append(
+                    Review._meta.get_field('pub_date').auto_now_add)
+            return bulk_create(queryset, objs, *args, **kwargs)
+
+        monkeypatch.setattr(QuerySet, 'bulk_create', recording_bulk_create)
+        call_command('loadcsv', stdout=io.StringIO())
+        assert flags and all(flags), (
+            'Проверьте, что загрузка не меняет общие для процесса '
+            'поля модели.'
+        )
+        assert str(Review.objects.get(pk=1).pub_date.date()) == '2019-09-24'
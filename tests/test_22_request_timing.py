@@ -0,0 +1,65 @@
+import logging
+import re
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Category, Title
+
+SERVER_TIMING_PATTERN = re.compile(
+    r'db;dur=[\d.]+;desc="(\d+) queries", '
+    r'serializer;dur=([\d.]+), total;dur=([\d.]+)'
+)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22RequestTiming:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_server_timing_header(self, client, caplog):
+        category = Category.objects.create(name='Фильм', slug='movie')
+        for idx in range(3):
+            Title.objects.create(
+                name=f'Фильм {idx}', year=2000, category=category)
+        with caplog.at_level(logging.INFO, logger='api.timing'):
+            with CaptureQueriesContext(connection) as queries:
+                response = client.get(self.TITLES_URL)
+        match = SERVER_TIMING_PATTERN.fullmatch(
+            response.get('Server-Timing', ''))
+        assert match, (
+            'Проверьте, что ответ содержит заголовок `Server-Timing` с '
+            'временем БД, сериализации и обработки запроса.'
+        )
+        assert int(match[1]) == len(queries), (
+            'Проверьте, что в `Server-Timing` указано число запросов к БД.'
+        )
+        assert 0 < float(match[2]) <= float(match[3])
+
+        record, = caplog.records
+        assert record.levelno == logging.INFO
+        assert record.timing['path'] == self.TITLES_URL
+        assert record.timing['queries'] == len(queries)
+        assert not record.timing['over_budget']
+
+    def test_02_over_budget_warning(self, client, caplog, settings):
+        settings.REQUEST_QUERY_BUDGET = 0
+        with caplog.at_level(logging.INFO, logger='api.timing'):
+            client.get(self.TITLES_URL)
+        record, = caplog.records
+        assert record.levelno == logging.WARNING, (
+            'Проверьте, что запросы сверх бюджета отмечаются '
+            'предупреждением в логе.'
+        )
+        assert record.timing['over_budget']
+
+    def test_03_timing_log_configured(self, client, caplog):
+        logger = logging.getLogger('api.timing')
+        assert logger.isEnabledFor(logging.INFO) and logger.handlers, (
+            'Проверьте, что в LOGGING настроен вывод лога api.timing '
+            'уровня INFO.'
+        )
+        client.get(self.TITLES_URL)
+        assert [record.levelno for record in caplog.records] == [
+            logging.INFO]
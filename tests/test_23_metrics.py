@@ -0,0 +1,82 @@
+import os
+import subprocess
+import sys
+from http import HTTPStatus
+
+import pytest
+from prometheus_client import REGISTRY
+
+from tests.conftest import MANAGE_PATH
+
+INCREMENT_SCRIPT = (
+    'from api_yamdb.metrics import REQUESTS; '
+    'REQUESTS.labels("title-list", "GET", 200).inc(3)'
+)
+COLLECT_SCRIPT = (
+    'from prometheus_client import generate_latest; '
+    'from api_yamdb.metrics import get_registry; '
+    'print(generate_latest(get_registry()).decode())'
+)
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23Metrics:
+
+    METRICS_URL = '/metrics'
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_request_metrics(self, client):
+        labels = {'route': 'title-list', 'method': 'GET'}
+        requests = sample(
+            'yamdb_http_requests_total', status='200', **labels)
+        latency = sample(
+            'yamdb_http_request_duration_seconds_count', **labels)
+        hits = sample('yamdb_catalog_cache_requests_total', result='hit')
+        misses = sample('yamdb_catalog_cache_requests_total', result='miss')
+
+        client.get(self.TITLES_URL)
+        client.get(self.TITLES_URL)
+
+        assert sample(
+            'yamdb_http_requests_total', status='200', **labels
+        ) == requests + 2, (
+            'Проверьте, что запросы учитываются по имени маршрута.'
+        )
+        assert sample(
+            'yamdb_http_request_duration_seconds_count', **labels
+        ) == latency + 2
+        assert sample(
+            'yamdb_catalog_cache_requests_total', result='hit') == hits + 1
+        assert sample(
+            'yamdb_catalog_cache_requests_total', result='miss') == misses + 1
+
+        response = client.get(self.METRICS_URL)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Эндпоинт `{self.METRICS_URL}` не найден или недоступен.'
+        )
+        content = response.content.decode()
+        for name in ('yamdb_http_requests_total',
+                     'yamdb_http_request_db_queries_bucket',
+                     'yamdb_emails_total'):
+            assert name in content, (
+                f'Проверьте, что `{self.METRICS_URL}` отдаёт метрику {name}.'
+            )
+
+    def test_02_multiprocess_aggregation(self, tmp_path):
+        env = {**os.environ, 'PROMETHEUS_MULTIPROC_DIR': str(tmp_path)}
+        for _ in range(2):
+            subprocess.run(
+                [sys.executable, '-c', INCREMENT_SCRIPT],
+                cwd=MANAGE_PATH, env=env, check=True)
+        result = subprocess.run(
+            [sys.executable, '-c', COLLECT_SCRIPT],
+            cwd=MANAGE_PATH, env=env, check=True, capture_output=True,
+            text=True)
+        assert ('yamdb_http_requests_total{method="GET",route="title-list",'
+                'status="200"} 6.0') in result.stdout, (
+            'Проверьте, что метрики суммируются по всем процессам.'
+        )
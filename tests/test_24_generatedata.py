@@ -0,0 +1,69 @@
+import io
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import Count
+
+from reviews.models import Comment, GenreTitle, Review, Title, User
+
+GENERATE_OPTIONS = {
+    'reviews': 2000, 'titles': 100, 'users': 400, 'comments': 300,
+    'end_date': '2024-06-01', 'stdout': io.StringIO(),
+}
+
+
+def read_files(path):
+    return {file.name: file.read_bytes() for file in path.iterdir()}
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24GenerateData:
+
+    def test_01_csv_is_deterministic(self, tmp_path):
+        for name, seed in (('first', 1), ('second', 1), ('other', 2)):
+            call_command('generatedata', output_dir=tmp_path / name,
+                         seed=seed, **GENERATE_OPTIONS)
+        first = read_files(tmp_path / 'first')
+        assert first == read_files(tmp_path / 'second'), (
+            'Проверьте, что при одинаковом seed данные совпадают.'
+        )
+        assert first['review.csv'] != read_files(
+            tmp_path / 'other')['review.csv']
+
+    def test_02_csv_loads_with_loadcsv(self, tmp_path):
+        call_command('generatedata', output_dir=tmp_path, **GENERATE_OPTIONS)
+        call_command('loadcsv', data_dir=str(tmp_path), stdout=io.StringIO())
+        assert (Title.objects.count(), User.objects.count(),
+                Review.objects.count(), Comment.objects.count()) == (
+            100, 400, 2000, 300), (
+            'Проверьте, что csv-файлы загружаются командой `loadcsv`.'
+        )
+
+    def test_03_insert_into_db(self):
+        call_command('generatedata', **GENERATE_OPTIONS)
+        assert Review.objects.count() == 2000
+        assert Comment.objects.count() == 300
+        assert GenreTitle.objects.exists()
+        counts = sorted(
+            Review.objects.order_by().values('title').annotate(
+                count=Count('id')).values_list('count', flat=True),
+            reverse=True)
+        assert counts[0] > 5 * counts[len(counts) // 2], (
+            'Проверьте, что популярность произведений неравномерна.'
+        )
+        title = Title.objects.order_by('-rating_count').first()
+        assert title.rating_count == counts[0], (
+            'Проверьте, что после генерации пересчитываются рейтинги.'
+        )
+        assert list(Review.objects.order_by('id').values_list(
+            'pub_date', flat=True)) == list(Review.objects.order_by(
+                'pub_date', 'id').values_list('pub_date', flat=True))
+
+        with pytest.raises(CommandError):
+            call_command('generatedata', **GENERATE_OPTIONS)
+
+    def test_04_too_few_pairs(self):
+        with pytest.raises(CommandError):
+            call_command('generatedata', **{
+                **GENERATE_OPTIONS, 'titles': 10, 'users': 10})
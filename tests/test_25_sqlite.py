@@ -0,0 +1,76 @@
+import threading
+import time
+
+import pytest
+from django.conf import settings
+from django.db import OperationalError, connection
+
+from api_yamdb.sqlite3.base import DatabaseWrapper
+
+BUSY_TIMEOUT = 0.05
+
+
+def make_connection(path, **options):
+    return DatabaseWrapper({
+        **connection.settings_dict,
+        'NAME': str(path),
+        'OPTIONS': {
+            'timeout': BUSY_TIMEOUT,
+            'transaction_mode': 'IMMEDIATE',
+            'init_command': ';'.join(settings.SQLITE_PRAGMAS),
+            **options,
+        },
+    })
+
+
+def fetch_pragma(wrapper, name):
+    with wrapper.cursor() as cursor:
+        cursor.execute(f'PRAGMA {name}')
+        return cursor.fetchone()[0]
+
+
+@pytest.fixture
+def db_access(django_db_blocker):
+    with django_db_blocker.unblock():
+        yield
+
+
+@pytest.mark.usefixtures('db_access')
+class Test25SQLite:
+
+    def test_01_pragmas_on_connect(self, tmp_path):
+        wrapper = make_connection(tmp_path / 'db.sqlite3')
+        try:
+            assert fetch_pragma(wrapper, 'journal_mode') == 'wal', (
+                'Проверьте, что база SQLite работает в режиме WAL.'
+            )
+            assert fetch_pragma(wrapper, 'synchronous') == 1
+            assert fetch_pragma(wrapper, 'temp_store') == 2
+            assert fetch_pragma(wrapper, 'busy_timeout') == (
+                BUSY_TIMEOUT * 1000)
+        finally:
+            wrapper.close()
+
+    def test_02_immediate_transaction_retries_lock(self, tmp_path):
+        path = tmp_path / 'db.sqlite3'
+        holder = make_connection(path)
+        waiter = make_connection(path, lock_retries=3)
+        try:
+            holder.ensure_connection()
+            holder._start_transaction_under_autocommit()
+            started = time.monotonic()
+            with pytest.raises(OperationalError):
+                make_connection(path)._start_transaction_under_autocommit()
+            assert time.monotonic() - started >= BUSY_TIMEOUT
+
+            release = threading.Timer(
+                0.2, holder.connection.execute, args=('ROLLBACK',))
+            release.start()
+            waiter._start_transaction_under_autocommit()
+            release.join()
+            assert waiter.connection.in_transaction, (
+                'Проверьте, что BEGIN повторяется, пока база занята.'
+            )
+        finally:
+            waiter.close()
+            holder.close()
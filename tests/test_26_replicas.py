@@ -0,0 +1,153 @@
+from contextlib import ExitStack
+from http import HTTPStatus
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import CaptureQueriesContext
+
+from api.management.commands.syncreplica import copy_database
+from api.replicas import check_pin_cache
+from api_yamdb.routers import ReplicaRouter, replica_reads
+from reviews.models import Title
+from tests.test_25_sqlite import make_connection
+from tests.utils import create_single_review, create_titles
+
+REPLICA = 'replica'
+
+
+def count_queries(func):
+    """Количество запросов к основной базе и к реплике во время func()."""
+    with ExitStack() as stack:
+        default, replica = (
+            stack.enter_context(CaptureQueriesContext(connections[alias]))
+            for alias in (DEFAULT_DB_ALIAS, REPLICA)
+        )
+        func()
+    return len(default), len(replica)
+
+
+@pytest.fixture
+def replicas(settings):
+    settings.DATABASE_REPLICAS = [REPLICA]
+
+
+@pytest.mark.django_db(transaction=True, databases=[DEFAULT_DB_ALIAS, REPLICA])
+class Test26Replicas:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_safe_requests_read_from_replica(self, client, admin_client,
+                                                user_client, replicas):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'Отлично', 8)
+        urls = (
+            self.TITLES_URL,
+            f'{self.TITLES_URL}{title_id}/',
+            '/api/v1/categories/',
+            '/api/v1/genres/',
+            f'{self.TITLES_URL}{title_id}/reviews/',
+        )
+        for url in urls:
+            default, replica = count_queries(lambda: client.get(url))
+            assert (default, bool(replica)) == (0, True), (
+                f'Проверьте, что GET-запрос к `{url}` читает из реплики.'
+            )
+
+    def test_02_without_replicas_reads_from_default(self, client,
+                                                    admin_client):
+        create_titles(admin_client)
+        default, replica = count_queries(
+            lambda: client.get(self.TITLES_URL))
+        assert default and not replica
+
+    def test_03_writes_go_to_default(self, admin_client, replicas):
+        create_titles(admin_client)
+        default, replica = count_queries(lambda: admin_client.post(
+            '/api/v1/categories/', data={'name': 'Музыка', 'slug': 'music'}))
+        assert default and not replica, (
+            'Проверьте, что изменяющие запросы выполняются в основной базе.'
+        )
+
+    def test_04_writer_is_pinned_to_default(self, client, admin_client,
+                                            user_client, replicas, settings):
+        titles, _, _ = create_titles(admin_client)
+        url = f'{self.TITLES_URL}{titles[0]["id"]}/reviews/'
+        response = create_single_review(
+            user_client, titles[0]['id'], 'Отлично', 8)
+        assert response.status_code == HTTPStatus.CREATED
+
+        default, replica = count_queries(lambda: user_client.get(url))
+        assert default and not replica, (
+            'Проверьте, что после записи чтения пользователя идут '
+            'в основную базу.'
+        )
+        default, replica = count_queries(lambda: client.get(url))
+        assert replica and not default, (
+            'Проверьте, что закрепление касается только автора записи.'
+        )
+
+        settings.REPLICA_PIN_SECONDS = 0
+        user_client.patch(
+            f'{url}{response.json()["id"]}/', data={'score': 9})
+        _, replica = count_queries(lambda: user_client.get(url))
+        assert replica, (
+            'Проверьте, что закрепление за основной базой истекает '
+            'через REPLICA_PIN_SECONDS.'
+        )
+
+    def test_05_other_views_read_from_default(self, admin_client, replicas):
+        default, replica = count_queries(
+            lambda: admin_client.get('/api/v1/users/'))
+        assert default and not replica
+
+    def test_06_write_pins_rest_of_request(self, replicas):
+        router = ReplicaRouter()
+        token = replica_reads.set(True)
+        try:
+            assert router.db_for_read(Title) == REPLICA
+            assert router.db_for_write(Title) == DEFAULT_DB_ALIAS
+            assert router.db_for_read(Title) == DEFAULT_DB_ALIAS, (
+                'Проверьте, что после записи запрос читает из основной базы.'
+            )
+        finally:
+            replica_reads.reset(token)
+        assert not router.allow_migrate(REPLICA, 'reviews')
+
+
+def test_pin_requires_shared_cache(settings, tmp_path):
+    check_pin_cache()
+    settings.DATABASE_REPLICAS = [REPLICA]
+    with pytest.raises(ImproperlyConfigured):
+        check_pin_cache()
+    settings.CACHES = {'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': tmp_path,
+    }}
+    check_pin_cache()
+
+
+def test_copy_database(tmp_path, django_db_blocker):
+    with django_db_blocker.unblock():
+        source = make_connection(tmp_path / 'db.sqlite3')
+        replica = make_connection(tmp_path / 'db-replica.sqlite3')
+        try:
+            with source.cursor() as cursor:
+                cursor.execute('CREATE TABLE item (name TEXT)')
+                cursor.execute("INSERT INTO item VALUES ('first')")
+            copy_database(source, replica)
+            with source.cursor() as cursor:
+                cursor.execute("INSERT INTO item VALUES ('second')")
+            with replica.cursor() as cursor:
+                cursor.execute('SELECT name FROM item')
+                assert cursor.fetchall() == [('first',)], (
+                    'Проверьте, что syncreplica копирует основную базу.'
+                )
+            copy_database(source, replica)
+            with replica.cursor() as cursor:
+                cursor.execute('SELECT count(*) FROM item')
+                assert cursor.fetchone() == (2,)
+        finally:
+            replica.close()
+            source.close()
@@ -0,0 +1,148 @@
+import threading
+import time
+
+import pytest
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import OperationalError, connection
+
+from api_yamdb.pool import close_pools
+from api_yamdb.sqlite3.base import DatabaseWrapper
+from tests.test_23_metrics import sample
+
+RELEASE_DELAY = 0.1
+
+
+@pytest.fixture
+def db_access(django_db_blocker):
+    with django_db_blocker.unblock():
+        yield
+    close_pools()
+
+
+@pytest.fixture
+def make_connection(tmp_path, request):
+    """Соединения с отдельной базой; псевдоним свой у каждого теста."""
+    alias = f'pool-{request.node.name}'
+
+    def make(pool=None, **overrides):
+        options = {
+            'init_command': ';'.join(settings.SQLITE_PRAGMAS),
+            **({'pool': pool} if pool else {}),
+        }
+        return DatabaseWrapper({
+            **connection.settings_dict,
+            'NAME': str(tmp_path / 'db.sqlite3'),
+            'CONN_MAX_AGE': 0,
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': options,
+            **overrides,
+        }, alias)
+    make.alias = alias
+    return make
+
+
+def checkouts(alias, result):
+    return sample(
+        'yamdb_db_pool_checkouts_total', alias=alias, result=result)
+
+
+@pytest.mark.usefixtures('db_access')
+class Test27ConnectionPool:
+
+    def test_01_pool_reuses_connections(self, make_connection):
+        wrapper = make_connection(pool={'max_size': 2})
+        wrapper.ensure_connection()
+        raw = wrapper.connection
+        wrapper.close()
+        other = make_connection(pool={'max_size': 2})
+        other.ensure_connection()
+        try:
+            assert other.connection is raw, (
+                'Проверьте, что закрытое соединение возвращается в пул '
+                'и выдаётся повторно.'
+            )
+            with other.cursor() as cursor:
+                cursor.execute('PRAGMA journal_mode')
+                assert cursor.fetchone()[0] == 'wal'
+        finally:
+            other.close()
+        alias = make_connection.alias
+        assert checkouts(alias, 'new') == 1
+        assert checkouts(alias, 'reused') == 1
+
+    def test_02_pool_waits_for_free_connection(self, make_connection):
+        pool = {'max_size': 1, 'timeout': RELEASE_DELAY * 2}
+        holder = make_connection(pool=pool)
+        holder.ensure_connection()
+        with pytest.raises(OperationalError):
+            make_connection(pool=pool).ensure_connection()
+        assert checkouts(make_connection.alias, 'timeout') == 1
+
+        waiter = make_connection(pool=pool)
+        holder.inc_thread_sharing()
+        release = threading.Timer(RELEASE_DELAY, holder.close)
+        started = time.monotonic()
+        release.start()
+        waiter.ensure_connection()
+        release.join()
+        waiter.close()
+        assert time.monotonic() - started >= RELEASE_DELAY
+        wait = sample('yamdb_db_pool_wait_seconds_sum',
+                      alias=make_connection.alias)
+        assert wait >= RELEASE_DELAY, (
+            'Проверьте, что ожидание соединения попадает в метрики пула.'
+        )
+
+    def test_03_broken_connections_replaced(self, make_connection):
+        wrapper = make_connection(pool=True)
+        wrapper.ensure_connection()
+        raw = wrapper.connection
+        wrapper.close()
+        raw.close()
+        wrapper.ensure_connection()
+        assert wrapper.connection is not raw, (
+            'Проверьте, что соединения из пула проверяются перед выдачей.'
+        )
+        with wrapper.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        wrapper.close()
+
+    def test_04_expired_connections_replaced(self, make_connection):
+        wrapper = make_connection(pool={'max_lifetime': 0})
+        wrapper.ensure_connection()
+        raw = wrapper.connection
+        wrapper.close()
+        wrapper.ensure_connection()
+        assert wrapper.connection is not raw, (
+            'Проверьте, что соединения старше max_lifetime переоткрываются.'
+        )
+        wrapper.close()
+
+    def test_05_pool_requires_non_persistent_connections(
+            self, make_connection):
+        wrapper = make_connection(pool=True, CONN_MAX_AGE=60)
+        with pytest.raises(ImproperlyConfigured):
+            wrapper.ensure_connection()
+
+    def test_06_persistent_connection_health_check(
+            self, make_connection, monkeypatch):
+        wrapper = make_connection(CONN_MAX_AGE=None)
+        wrapper.ensure_connection()
+        raw = wrapper.connection
+        wrapper.close_if_unusable_or_obsolete()
+        with wrapper.cursor():
+            pass
+        assert wrapper.connection is raw, (
+            'Проверьте, что постоянное соединение переживает запрос.'
+        )
+
+        monkeypatch.setattr(wrapper, 'is_usable', lambda: False)
+        wrapper.close_if_unusable_or_obsolete()
+        with wrapper.cursor():
+            pass
+        assert wrapper.connection is not raw, (
+            'Проверьте, что нерабочее постоянное соединение '
+            'переоткрывается перед первым запросом.'
+        )
+        wrapper.close()
@@ -0,0 +1,124 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Comment, Review, Title, User
+from tests.utils import create_single_review, create_titles
+
+EMPTY_HISTOGRAM = {str(score): 0 for score in range(1, 11)}
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28ReviewCounters:
+
+    STATS_URL_TEMPLATE = '/api/v1/titles/{title_id}/stats/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def test_01_user_delete_cascades_to_counters(self, client, admin_client,
+                                                 user_client, user):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'Отлично', 10)
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(title_id=title_id)
+        etag = client.get(reviews_url)['ETag']
+
+        response = admin_client.delete(f'/api/v1/users/{user.username}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+
+        data = client.get(
+            self.STATS_URL_TEMPLATE.format(title_id=title_id)).json()
+        assert (data['count'], data['rating']) == (0, None), (
+            'Проверьте, что удаление пользователя вместе с его отзывами '
+            'обновляет рейтинг произведения.'
+        )
+        assert data['histogram'] == EMPTY_HISTOGRAM
+        response = client.get(reviews_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после каскадного удаления отзывов список '
+            'отзывов не отдаётся как неизменённый.'
+        )
+        assert response.json()['results'] == []
+
+    def test_02_direct_model_changes_update_counters(
+            self, client, admin_client, user_client, moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'Отлично', 10)
+        create_single_review(moderator_client, title_id, 'Средне', 4)
+
+        review = Review.objects.get(score=4)
+        review.score = 6
+        review.save()
+        Review.objects.get(score=10).delete()
+
+        title = Title.objects.get(pk=title_id)
+        assert (title.rating_sum, title.rating_count) == (6, 1), (
+            'Проверьте, что счётчики оценок обновляются при изменении '
+            'и удалении отзывов вне API (например, в админке).'
+        )
+        expected = {**EMPTY_HISTOGRAM, '6': 1}
+        assert client.get(self.STATS_URL_TEMPLATE.format(
+            title_id=title_id)).json()['histogram'] == expected
+
+    def test_03_comment_cascade_changes_etag(self, client, admin_client,
+                                             user_client, moderator_client,
+                                             moderator):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        review = create_single_review(user_client, title_id, 'Отлично', 10)
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=title_id, review_id=review.json()['id'])
+        moderator_client.post(url, data={'text': 'Согласен'})
+        etag = client.get(url)['ETag']
+
+        Comment.objects.filter(author=moderator).get().delete()
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что удаление комментария вне API меняет ETag '
+            'списка комментариев.'
+        )
+
+    def test_04_review_moved_to_other_title(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        first, second = titles[0]['id'], titles[1]['id']
+        create_single_review(user_client, first, 'Отлично', 8)
+
+        review = Review.objects.get()
+        review.title_id = second
+        review.save()
+
+        counters = {
+            title.pk: (title.rating_sum, title.rating_count, title.score_8)
+            for title in Title.objects.filter(pk__in=(first, second))
+        }
+        assert counters == {first: (0, 0, 0), second: (8, 1, 1)}, (
+            'Проверьте, что перенос отзыва в другое произведение '
+            'обновляет счётчики обоих произведений.'
+        )
+
+    def test_05_title_delete_queries_do_not_grow(self):
+        def delete_title(reviews):
+            title = Title.objects.create(name='Произведение', year=2000)
+            for number in range(reviews):
+                author = User.objects.create(
+                    username=f'author{reviews}_{number}',
+                    email=f'author{reviews}_{number}@yamdb.fake')
+                review = Review.objects.create(
+                    title=title, author=author, text='Отзыв', score=5)
+                for _ in range(2):
+                    Comment.objects.create(
+                        review=review, author=author, text='Комментарий')
+            with CaptureQueriesContext(connection) as queries:
+                title.delete()
+            return len(queries)
+
+        assert delete_title(1) == delete_title(10), (
+            'Проверьте, что удаление произведения не обновляет счётчики '
+            'и отметки удаляемых вместе с ним отзывов по одному на строку.'
+        )
+        assert not Review.objects.exists()